@@ -3,10 +3,16 @@ Main medical query endpoints for HealthLang AI MVP
 """
 
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, Optional
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Dict, Any, List, Optional
 
+import orjson
 from fastapi import APIRouter, Request, HTTPException, Depends
+from fastapi.responses import Response
 from pydantic import BaseModel, Field, field_validator
 from prometheus_client import Counter, Histogram, Gauge
 from sqlalchemy.orm import Session
@@ -16,6 +22,7 @@ from app.core.workflow import HealthLangWorkflow
 from app.database import get_db
 from app.services.query_service import QueryService
 from app.models.database_models import User
+from app.models.response_models import BatchQueryResponse
 
 from app.utils.logger import get_logger
 from app.utils.metrics import record_query_metrics
@@ -88,6 +95,48 @@ class MedicalQueryResponse(BaseModel):
     error: Optional[str] = None
 
 
+@dataclass(slots=True)
+class BatchQueryResult:
+    """Single batch item, serialized directly by orjson (no Pydantic dump)"""
+
+    request_id: str
+    original_query: str
+    response: str
+    success: bool
+    error: Optional[str]
+    metadata: Dict[str, Any]
+
+
+def _orjson_default(obj: Any) -> Any:
+    """
+    Encode the non-native types responses are known to carry.
+    
+    Anything else raises TypeError (surfaced by orjson as JSONEncodeError)
+    instead of being silently stringified into the response.
+    """
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, PurePath):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _json_response(payload: Any) -> Response:
+    """UTF-8 JSON bytes straight from orjson, without a str round trip"""
+    return Response(
+        content=orjson.dumps(
+            payload, default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY
+        ),
+        media_type="application/json; charset=utf-8",
+    )
+
+
 # Global workflow instance
 workflow: Optional[HealthLangWorkflow] = None
 
@@ -207,11 +256,7 @@ async def process_medical_query(
             # Don't fail the request if database logging fails
             logger.error(f"Failed to save query history: {db_error}")
 
-        from fastapi.responses import JSONResponse
-        return JSONResponse(
-            content=response.model_dump(),
-            headers={"Content-Type": "application/json; charset=utf-8"}
-        )
+        return _json_response(response.model_dump())
 
     except Exception as e:
         query_counter.labels(
@@ -261,12 +306,7 @@ async def process_medical_query(
         except Exception as db_error:
             logger.error(f"Failed to save error query history: {db_error}")
         
-        from fastapi.responses import JSONResponse
-        return JSONResponse(
-            content=err_response.model_dump(),
-            headers={"Content-Type": "application/json; charset=utf-8"},
-            status_code=200,
-        )
+        return _json_response(err_response.model_dump())
     finally:
         duration = (datetime.now() - start_time).total_seconds()
         query_duration.labels(
@@ -323,15 +363,19 @@ async def get_query_status(
         )
 
 
-@router.post("/query/batch")
+@router.post("/query/batch", response_model=BatchQueryResponse)
 async def process_batch_queries(
     requests: list[MedicalQueryRequest],
     http_request: Request,
     workflow: HealthLangWorkflow = Depends(get_workflow),
-) -> Dict[str, Any]:
+) -> Response:
     """
     Process multiple medical queries in batch
     
+    Results are collected as slotted dataclasses and encoded in a single
+    orjson pass rather than dumping each item through Pydantic;
+    BatchQueryResponse only documents the payload in the OpenAPI schema.
+    
     Args:
         requests: List of medical query requests
         http_request: The HTTP request object
@@ -355,21 +399,21 @@ async def process_batch_queries(
     
     logger.info(f"Processing batch of {len(requests)} queries (ID: {batch_id})")
     
-    results = []
+    results: List[BatchQueryResult] = []
     errors = []
     
     for i, request in enumerate(requests):
         request_id = f"{batch_id}-{i+1}"
         try:
             result = await workflow.process_query(request.text)
-            results.append({
-                "request_id": request_id,
-                "original_query": request.text,
-                "response": result["response"],
-                "success": result["success"],
-                "error": result.get("error"),
-                "metadata": result["metadata"]
-            })
+            results.append(BatchQueryResult(
+                request_id=request_id,
+                original_query=request.text,
+                response=result["response"],
+                success=result["success"],
+                error=result.get("error"),
+                metadata=result["metadata"],
+            ))
         except Exception as e:
             logger.error(f"Error processing batch item {i+1} (ID: {request_id}): {e}")
             errors.append({
@@ -378,7 +422,7 @@ async def process_batch_queries(
                 "error": str(e),
             })
     
-    return {
+    payload = {
         "batch_id": batch_id,
         "total_requests": len(requests),
         "successful": len(results),
@@ -387,6 +431,7 @@ async def process_batch_queries(
         "errors": errors,
         "timestamp": datetime.now().isoformat(),
     }
+    return _json_response(payload)
 
 
 @router.get("/supported-languages")
@@ -50,7 +50,23 @@ class Settings(BaseSettings):
     )
     OPENAI_MODEL: str = Field(default="gpt-3.5-turbo", env="OPENAI_MODEL")
     LOCAL_MODEL: str = Field(default="llama-3-8b", env="LOCAL_MODEL")
+    # Smaller model for one-word safety triage, e.g. "llama-3.1-8b-instant"
+    # on Groq (unset = provider default model)
+    SAFETY_MODEL: Optional[str] = Field(default=None, env="SAFETY_MODEL")
     LLM_TIMEOUT: int = Field(default=30, env="LLM_TIMEOUT")
+    # Connection pool sizing for the shared LLM HTTP clients
+    LLM_MAX_CONNECTIONS: int = Field(default=100, env="LLM_MAX_CONNECTIONS")
+    LLM_MAX_KEEPALIVE: int = Field(default=20, env="LLM_MAX_KEEPALIVE")
+    # Attempts after the first for transient provider failures (429/5xx)
+    LLM_MAX_RETRIES: int = Field(default=3, env="LLM_MAX_RETRIES")
+    # Exact-match cache for low-temperature, non-streaming generations
+    LLM_CACHE_ENABLED: bool = Field(default=True, env="LLM_CACHE_ENABLED")
+    LLM_CACHE_TTL: int = Field(default=3600, env="LLM_CACHE_TTL")
+    # "memory" (per process) or "redis" (shared via REDIS_URL, msgpack)
+    LLM_CACHE_BACKEND: str = Field(default="memory", env="LLM_CACHE_BACKEND")
+    # Client-side Groq throttle just under the account limits (0 = off)
+    GROQ_RPM: int = Field(default=0, env="GROQ_RPM")
+    GROQ_TPM: int = Field(default=0, env="GROQ_TPM")
     # Global system prompt to shape assistant persona and safety behavior
     SYSTEM_PROMPT: str = Field(
         default=(
@@ -346,6 +362,10 @@ class Settings(BaseSettings):
         env="MCP_HEALTHCARE_SERVER_PATH",
     )
     MCP_TIMEOUT: int = Field(default=30, env="MCP_TIMEOUT")
+    # Upper bound on concurrent outbound MCP HTTP requests per worker
+    MCP_MAX_CONCURRENCY: int = Field(default=32, env="MCP_MAX_CONCURRENCY")
+    # Seconds of inactivity before the stdio MCP subprocess is shut down
+    MCP_IDLE_TIMEOUT: int = Field(default=600, env="MCP_IDLE_TIMEOUT")
     
     # Development Configuration
     TESTING: bool = Field(default=False, env="TESTING")
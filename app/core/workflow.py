@@ -10,6 +10,7 @@ import json
 from typing import Any, Dict, List, Optional, TypedDict, Tuple
 
 import httpx
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from app.config import settings
@@ -43,6 +44,18 @@ except (ImportError, ModuleNotFoundError):
 
 logger = get_logger(__name__)
 
+
+# Phrases showing a response already ends with a follow-up offer
+_FOLLOWUP_MARKERS = (
+    "simpler", "checklist", "clinics", "interpret", "plan",
+    "tailor", "next steps", "when to",
+)
+
+
+def _stream_event(event: str, data: Any) -> str:
+    """One newline-delimited JSON event for process_query_stream"""
+    return orjson.dumps({"event": event, "data": data}).decode() + "\n\n"
+
 # State definition for the workflow
 
 
@@ -714,13 +727,15 @@ class HealthLangWorkflow:
           without auto-translation.
         - Appends a Sources section (information-prominent style).
         """
-        out = response.strip()
-        low = out.lower()
+        body = response.strip()
+        low = body.lower()
+        # Pieces are collected and joined once at the end
+        parts = [body]
 
         # Add a brief opinion if missing (only for medical queries)
         is_medical = await self._is_medical_query(original_query)
         if "my take:" not in low and is_medical:
-            out += (
+            parts.append(
                 "\n\nMy take: Based on current medical guidance, it's "
                 "best to monitor symptoms, reduce risk factors, and speak "
                 "with a clinician for personalized advice."
@@ -728,18 +743,17 @@ class HealthLangWorkflow:
 
         # Add one contextual follow-up (topic/intent aware;
         # no auto-Pidgin unless asked)
-        followup = await self._build_contextual_followup(original_query, out)
+        followup = await self._build_contextual_followup(
+            original_query, "".join(parts)
+        )
         # Only append if we didn't already add something similar
-        if not any(p in low for p in [
-            "simpler", "checklist", "clinics", "interpret", "plan",
-            "tailor", "next steps", "when to"
-        ]):
-            out += "\n\n" + followup
+        if not any(p in low for p in _FOLLOWUP_MARKERS):
+            parts.append("\n\n" + followup)
 
         # Append sources if available and not present (medical only)
         sources = context_meta.get("sources", [])
         if sources and "sources:" not in low and is_medical:
-            out += "\n\nSources:\n"
+            parts.append("\n\nSources:\n")
             # Limit to top 5 to keep tidy
             for s in sources[:5]:
                 title = s.get("title") or s.get("source") or "Reference"
@@ -772,13 +786,13 @@ class HealthLangWorkflow:
                     f" — {', '.join(details)}" if details else ""
                 )
                 if url:
-                    out += (
+                    parts.append(
                         f"- [{title}]({url}) — {src}{mixed_tail}\n"
                     )
                 else:
-                    out += f"- {title} — {src}{mixed_tail}\n"
+                    parts.append(f"- {title} — {src}{mixed_tail}\n")
 
-        return out
+        return "".join(parts)
 
     async def _call_translation_service(
         self,
@@ -996,7 +1010,8 @@ class HealthLangWorkflow:
             self._general_knowledge_rag = TavilyKnowledgeService(settings)
             self._rag_initialized = True
             logger.info("RAG components initialized")
-        except (RuntimeError, ValueError) as e:
+        except (RuntimeError, ValueError, ImportError) as e:
+            # torch / sentence_transformers are imported on construction
             logger.warning(f"Failed to initialize RAG components: {e}")
             self._rag_initialized = False
     
@@ -1101,17 +1116,17 @@ class HealthLangWorkflow:
         """
         try:
             # Yield status update: validating query
-            yield json.dumps({"event": "status", "data": "Validating medical query..."}) + "\n\n"
+            yield _stream_event("status", "Validating medical query...")
             
             detected_language = "en"
             
             # Yield status update: gathering context
-            yield json.dumps({"event": "status", "data": "Gathering medical context..."}) + "\n\n"
+            yield _stream_event("status", "Gathering medical context...")
             search_query = original_query if original_query else query
             context_text, context_meta = await self._gather_context(search_query)
             
             # Yield status update: generating response
-            yield json.dumps({"event": "status", "data": "Generating medical response..."}) + "\n\n"
+            yield _stream_event("status", "Generating medical response...")
             
             # Stream the actual response using LLM streaming
             from app.services.medical.llm_client import LLMClient, LLMRequest
@@ -1135,21 +1150,15 @@ Context:\n{context_text if context_text else 'No additional context available.'}
             
             # Stream response chunks
             async for chunk in llm_client.streaming_generate(request):
-                yield json.dumps({"event": "content", "data": chunk}) + "\n\n"
+                yield _stream_event("content", chunk)
             
             # Yield sources if available
             if context_meta.get("sources"):
-                yield json.dumps({
-                    "event": "sources",
-                    "data": context_meta["sources"]
-                }) + "\n\n"
+                yield _stream_event("sources", context_meta["sources"])
             
             # Yield completion event
-            yield json.dumps({"event": "done", "data": "complete"}) + "\n\n"
+            yield _stream_event("done", "complete")
             
         except Exception as e:
             logger.error(f"Streaming query processing failed: {e}")
-            yield json.dumps({
-                "event": "error",
-                "data": f"Error processing query: {str(e)}"
-            }) + "\n\n"
+            yield _stream_event("error", f"Error processing query: {str(e)}")
@@ -47,12 +47,32 @@ def init_db() -> None:
     try:
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
+        create_missing_indexes()
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Failed to create database tables: {e}")
         raise
 
 
+def create_missing_indexes(bind=None) -> None:
+    """
+    Create model indexes that the database does not have yet.
+    
+    create_all skips tables that already exist, so an index added to a
+    model later never reaches an existing database. checkfirst makes each
+    step a no-op once the index exists. On a large PostgreSQL table, build
+    the index with CREATE INDEX CONCURRENTLY before deploying instead of
+    letting startup take the write lock.
+    
+    Args:
+        bind: Engine or connection to use (defaults to the app engine)
+    """
+    bind = bind if bind is not None else engine
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency function to get database session.
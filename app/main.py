@@ -78,6 +78,7 @@ async def lifespan(app: FastAPI):
         try:
             from app.services.medical.llm_client import LLMClient
             app.state.llm_client = LLMClient()
+            await app.state.llm_client.warmup()
             logger.info("LLMClient initialized")
         except Exception as e:
             logger.error(f"LLMClient initialization failed: {e}")
@@ -97,12 +98,29 @@ async def lifespan(app: FastAPI):
     finally:
         logger.info("Shutting down HealthLang AI MVP application...")
 
-        # Cleanup workflow
+        from app.services.mcp_client_http import close_client
+        from app.services.medical.llm_client import close_http_clients
+        from app.services.medical.llm_cache import close_llm_cache
+
+        shutdown_steps = []
         if workflow:
-            await workflow.cleanup()
-        # Cleanup translation service
+            shutdown_steps.append(("workflow", workflow.cleanup))
         if hasattr(app.state, "translation_service"):
-            await app.state.translation_service.cleanup()
+            shutdown_steps.append(
+                ("translation service", app.state.translation_service.cleanup)
+            )
+        shutdown_steps += [
+            ("MCP HTTP client", close_client),
+            ("LLM HTTP clients", close_http_clients),
+            ("LLM cache", close_llm_cache),
+        ]
+        # Guard each step so one failing close (e.g. Redis already gone)
+        # does not skip the rest
+        for name, close in shutdown_steps:
+            try:
+                await close()
+            except Exception as e:
+                logger.error(f"Failed to close {name} during shutdown: {e}")
 
 
 # Create FastAPI application
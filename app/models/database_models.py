@@ -119,6 +119,10 @@ class Query(Base):
     # Relationships
     user = relationship("User", back_populates="queries")
     
+    # Load server defaults (created_at) via INSERT ... RETURNING where the
+    # dialect supports it, so inserts need no follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Indexes
     __table_args__ = (
         Index('idx_queries_user_id', 'user_id'),
@@ -128,6 +132,16 @@ class Query(Base):
         Index('idx_queries_query_type', 'query_type'),
         Index('idx_queries_safety_level', 'safety_level'),
         Index('idx_queries_success', 'success'),
+        # Serves per-user history ordered newest first; id breaks timestamp
+        # ties for the keyset cursor. Named apart from the earlier
+        # (user_id, timestamp) index so create_missing_indexes builds it on
+        # databases that already have that one.
+        Index(
+            'idx_queries_user_timestamp_id',
+            'user_id',
+            timestamp.desc(),
+            id.desc(),
+        ),
     )
 
 
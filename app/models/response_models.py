@@ -57,14 +57,31 @@ class TranslationResponse(BaseModel):
     request_id: Optional[str] = Field(default=None, description="Request identifier")
 
 
+class BatchQueryItem(BaseModel):
+    """Single successful item of a batch query response."""
+    request_id: str = Field(..., description="Item identifier (batch ID and position)")
+    original_query: str = Field(..., description="Original query")
+    response: str = Field(..., description="Generated response")
+    success: bool = Field(..., description="Whether the workflow succeeded")
+    error: Optional[str] = Field(default=None, description="Workflow error, if any")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Processing metadata")
+
+
+class BatchQueryError(BaseModel):
+    """Batch item that raised before producing a response."""
+    index: int = Field(..., description="Position of the item in the batch")
+    request_id: str = Field(..., description="Item identifier")
+    error: str = Field(..., description="Error message")
+
+
 class BatchQueryResponse(BaseModel):
-    """Batch query response model."""
+    """Batch query response model (schema of the /query/batch payload)."""
     batch_id: str = Field(..., description="Batch identifier")
-    total_queries: int = Field(..., description="Total number of queries")
-    successful_queries: int = Field(..., description="Number of successful queries")
-    failed_queries: int = Field(..., description="Number of failed queries")
-    results: List[MedicalQueryResponse] = Field(..., description="Query results")
-    processing_time: float = Field(..., description="Total processing time")
+    total_requests: int = Field(..., description="Total number of queries")
+    successful: int = Field(..., description="Number of items with a response")
+    failed: int = Field(..., description="Number of items that raised")
+    results: List[BatchQueryItem] = Field(..., description="Query results")
+    errors: List[BatchQueryError] = Field(default_factory=list, description="Failed items")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Response timestamp")
 
 
@@ -1,4 +1,6 @@
 from typing import List, Optional, Tuple
+
+import orjson
 from sqlalchemy.orm import Session
 from sqlalchemy import select, desc
 from app.models.database_models import (
@@ -258,18 +260,18 @@ class ChatService:
         )
         composed = "\n".join(context_lines)
 
-        # Stream the response
-        full_response = ""
+        # Stream the response, collecting content pieces for one final join
+        response_parts: List[str] = []
         async for event in self.workflow.process_query_stream(composed, original_query=user_text):
             yield event
             # Parse event to collect response text
             try:
-                import json
-                event_data = json.loads(event.strip())
+                event_data = orjson.loads(event)
                 if event_data.get("event") == "content":
-                    full_response += event_data.get("data", "")
-            except (json.JSONDecodeError, ValueError, KeyError):
+                    response_parts.append(event_data.get("data", ""))
+            except (orjson.JSONDecodeError, ValueError, KeyError):
                 pass
+        full_response = "".join(response_parts)
 
         # Save assistant message
         if not full_response:
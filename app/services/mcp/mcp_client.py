@@ -4,26 +4,62 @@ MCP Client for HealthLang AI
 Handles communication with MCP servers for medical tools.
 """
 
+import asyncio
+import json
 import logging
-from typing import Any, Dict, List, Optional
-from contextlib import AsyncExitStack
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 # Conditional MCP import
 try:
+    import anyio
     from mcp import ClientSession, StdioServerParameters
     from mcp.client.stdio import stdio_client
     MCP_AVAILABLE = True
+    # Raised when the stdio subprocess dies underneath the session
+    _BROKEN_SESSION_ERRORS = (
+        BrokenPipeError,
+        ConnectionResetError,
+        anyio.ClosedResourceError,
+        anyio.BrokenResourceError,
+    )
 except ImportError:
     MCP_AVAILABLE = False
     ClientSession = None
     StdioServerParameters = None
     stdio_client = None
+    _BROKEN_SESSION_ERRORS = (BrokenPipeError, ConnectionResetError)
 
 from app.config import settings
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# String arguments above this size are decoded off the event loop
+_OFFLOAD_DECODE_BYTES = 64 * 1024
+
+# How long list_tools serves the cached tool list before asking the server
+_TOOLS_CACHE_TTL = 60.0
+
+# Scheduling delay above which a tool call logs an event-loop lag warning
+_LOOP_LAG_WARN_SECONDS = 0.05
+
+
+async def _measure_loop_lag() -> float:
+    """Seconds the loop takes to get back to us after yielding once"""
+    loop = asyncio.get_running_loop()
+    yielded_at = loop.time()
+    await asyncio.sleep(0)
+    return loop.time() - yielded_at
+
+
+def _decode_arguments(arguments: str) -> Dict[str, Any]:
+    """Parse tool arguments passed as a JSON string"""
+    try:
+        return json.loads(arguments)
+    except json.JSONDecodeError:
+        return {"query": arguments}
+
 
 class MCPClient:
     """MCP client for communicating with healthcare servers"""
@@ -33,8 +69,15 @@ class MCPClient:
             raise ImportError("MCP module is not available. Please install the 'mcp' package.")
         
         self.session: Optional[ClientSession] = None
-        self.exit_stack = AsyncExitStack()
+        # Owner task that holds the stdio transport and session open
+        self._session_task: Optional[asyncio.Task] = None
+        self._shutdown = asyncio.Event()
         self._initialized = False
+        self._last_used = time.monotonic()
+        self._idle_watchdog: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._tools_cache: Optional[List[Dict[str, Any]]] = None
+        self._tools_cache_at = 0.0
     
     async def initialize(self) -> None:
         """Initialize the MCP client and connect to servers"""
@@ -49,7 +92,7 @@ class MCPClient:
             logger.info("Initializing MCP client...")
             
             # Connect to healthcare server
-            await self._connect_to_healthcare_server()
+            await self.connect()
             
             self._initialized = True
             logger.info("MCP client initialized successfully")
@@ -58,6 +101,72 @@ class MCPClient:
             logger.error(f"Failed to initialize MCP client: {e}")
             raise
     
+    async def connect(self) -> None:
+        """Spawn the stdio server once and keep the session open"""
+        async with self._connect_lock:
+            await self._connect_locked()
+    
+    async def _connect_locked(self) -> None:
+        """connect() body; the caller holds _connect_lock"""
+        if self.session is not None:
+            return
+        await self._connect_to_healthcare_server()
+        self._last_used = time.monotonic()
+        if self._idle_watchdog is None or self._idle_watchdog.done():
+            self._idle_watchdog = asyncio.create_task(self._watch_idle())
+    
+    async def disconnect(self) -> None:
+        """Close the session and terminate the stdio subprocess"""
+        task = self._session_task
+        self._session_task = None
+        self.session = None
+        if task is None:
+            return
+        self._shutdown.set()
+        try:
+            await task
+        except Exception as e:
+            logger.debug(f"MCP session exited with error: {e}")
+    
+    async def _reconnect(self, broken: "ClientSession") -> None:
+        """
+        Replace a broken session with a fresh subprocess.
+        
+        Concurrent callers that saw the same failure queue on _connect_lock;
+        only the first tears ``broken`` down, the rest reuse its replacement.
+        """
+        async with self._connect_lock:
+            if self.session is broken:
+                logger.warning(
+                    "MCP session broken, reconnecting to healthcare server"
+                )
+                try:
+                    await self.disconnect()
+                except Exception as e:
+                    logger.debug(
+                        f"Ignoring error while dropping broken session: {e}"
+                    )
+            await self._connect_locked()
+    
+    async def _watch_idle(self) -> None:
+        """Shut down the subprocess after MCP_IDLE_TIMEOUT of inactivity"""
+        check_interval = min(30, settings.MCP_IDLE_TIMEOUT)
+        while self.session is not None:
+            await asyncio.sleep(check_interval)
+            # Under the lock so a reconnect in progress is not torn down
+            async with self._connect_lock:
+                idle_for = time.monotonic() - self._last_used
+                if self.session is None or idle_for <= settings.MCP_IDLE_TIMEOUT:
+                    continue
+                logger.info(
+                    f"MCP session idle for {idle_for:.0f}s, stopping subprocess"
+                )
+                try:
+                    await self.disconnect()
+                except Exception as e:
+                    logger.error(f"Failed to stop idle MCP session: {e}")
+                return
+    
     async def _connect_to_healthcare_server(self) -> None:
         """Connect to the healthcare MCP server"""
         try:
@@ -74,36 +183,68 @@ class MCPClient:
                 env=None
             )
             
-            # Connect to server
-            stdio_transport = await self.exit_stack.enter_async_context(
-                stdio_client(server_params)
+            # Start the owner task and wait until the session is initialized
+            # (or the task dies trying)
+            ready = asyncio.Event()
+            self._shutdown = asyncio.Event()
+            self._session_task = asyncio.create_task(
+                self._run_session(server_params, ready)
             )
-            self.stdio, self.write = stdio_transport
-            
-            # Create session
-            self.session = await self.exit_stack.enter_async_context(
-                ClientSession(self.stdio, self.write)
+            ready_waiter = asyncio.create_task(ready.wait())
+            await asyncio.wait(
+                {ready_waiter, self._session_task},
+                return_when=asyncio.FIRST_COMPLETED,
             )
+            if not ready.is_set():
+                ready_waiter.cancel()
+                task, self._session_task = self._session_task, None
+                task.result()  # re-raise the startup failure
+                raise ConnectionError("MCP session exited during startup")
             
-            # Initialize session
-            await self.session.initialize()
-            
-            # List available tools
-            response = await self.session.list_tools()
-            tools = response.tools
+            # List available tools (also primes the tool cache)
+            self._tools_cache = None
+            tools = await self.list_tools()
             
-            logger.info(f"Connected to healthcare server with tools: {[tool.name for tool in tools]}")
+            logger.info(f"Connected to healthcare server with tools: {[tool['name'] for tool in tools]}")
             
         except Exception as e:
             logger.error(f"Failed to connect to healthcare server: {e}")
             raise
     
+    async def _run_session(
+        self,
+        server_params: "StdioServerParameters",
+        ready: asyncio.Event,
+    ) -> None:
+        """
+        Own the stdio transport and session for their whole lifetime.
+        
+        Entering and exiting both contexts in one task keeps anyio's cancel
+        scopes intact, so shutdown and cancellation reach the subprocess
+        instead of leaving it dangling.
+        """
+        try:
+            async with stdio_client(server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    ready.set()
+                    await self._shutdown.wait()
+        finally:
+            self.session = None
+    
     async def list_tools(self) -> List[Dict[str, Any]]:
-        """Get list of available tools from the MCP server"""
+        """Get list of available tools (cached for _TOOLS_CACHE_TTL seconds)"""
         try:
             if not self.session:
                 return []
             
+            if (
+                self._tools_cache is not None
+                and time.monotonic() - self._tools_cache_at < _TOOLS_CACHE_TTL
+            ):
+                return self._tools_cache
+            
             response = await self.session.list_tools()
             tools = []
             
@@ -114,28 +255,57 @@ class MCPClient:
                     "inputSchema": tool.inputSchema
                 })
             
+            self._tools_cache = tools
+            self._tools_cache_at = time.monotonic()
             return tools
             
         except Exception as e:
+            self._tools_cache = None
             logger.error(f"Failed to get available tools: {e}")
             return []
     
+    # Older callers used this name
+    get_available_tools = list_tools
+    
     async def call_tool(self, tool_name: str, arguments: str) -> str:
         """Call a specific tool on the MCP server"""
         try:
+            if not self.session and self._initialized:
+                # Session was reaped by the idle watchdog; bring it back
+                await self.connect()
             if not self.session:
                 return f"Tool {tool_name} not available (no active session)"
             
-            # Parse arguments if they're passed as a string
+            # Parse arguments if they're passed as a string; large payloads
+            # are decoded in a worker thread so concurrent calls keep moving
             if isinstance(arguments, str):
-                try:
-                    import json
-                    arguments = json.loads(arguments)
-                except json.JSONDecodeError:
-                    arguments = {"query": arguments}
+                if len(arguments) > _OFFLOAD_DECODE_BYTES:
+                    arguments = await asyncio.to_thread(
+                        _decode_arguments, arguments
+                    )
+                else:
+                    arguments = _decode_arguments(arguments)
             
-            # Call the tool
-            response = await self.session.call_tool(tool_name, arguments)
+            # In debug mode, flag loop saturation that would serialize
+            # otherwise-concurrent tool calls
+            if settings.DEBUG:
+                lag = await _measure_loop_lag()
+                if lag > _LOOP_LAG_WARN_SECONDS:
+                    task = asyncio.current_task()
+                    logger.warning(
+                        f"Event loop lag {lag * 1000:.0f}ms before MCP tool "
+                        f"{tool_name} (task: {task.get_name() if task else '-'})"
+                    )
+            
+            # Call the tool, respawning the subprocess once if it died
+            self._last_used = time.monotonic()
+            session = self.session
+            try:
+                response = await session.call_tool(tool_name, arguments)
+            except _BROKEN_SESSION_ERRORS:
+                await self._reconnect(session)
+                response = await self.session.call_tool(tool_name, arguments)
+            self._last_used = time.monotonic()
             
             # Return the result
             if response.content:
@@ -147,6 +317,30 @@ class MCPClient:
             logger.error(f"Failed to call tool {tool_name}: {e}")
             return f"Error calling tool {tool_name}: {str(e)}"
     
+    async def call_tools_parallel(
+        self,
+        calls: List[Tuple[str, Dict[str, Any]]],
+    ) -> List[str]:
+        """
+        Run independent tool calls concurrently.
+        
+        Args:
+            calls: (tool_name, arguments) pairs
+            
+        Returns:
+            Tool results in the same order as ``calls``; failures are
+            returned as error strings like ``call_tool`` does
+        """
+        results = await asyncio.gather(
+            *(self.call_tool(name, args) for name, args in calls),
+            return_exceptions=True,
+        )
+        return [
+            f"Error calling tool {name}: {result}"
+            if isinstance(result, BaseException) else result
+            for (name, _), result in zip(calls, results)
+        ]
+    
     async def medical_lookup(self, query: str) -> str:
         """Perform medical information lookup"""
         return await self.call_tool("medical_lookup", {"query": query})
@@ -182,8 +376,10 @@ class MCPClient:
     async def cleanup(self) -> None:
         """Cleanup MCP client resources"""
         try:
-            if self.exit_stack:
-                await self.exit_stack.aclose()
+            if self._idle_watchdog and not self._idle_watchdog.done():
+                self._idle_watchdog.cancel()
+            self._idle_watchdog = None
+            await self.disconnect()
             self._initialized = False
             logger.info("MCP client cleaned up successfully")
         except Exception as e:
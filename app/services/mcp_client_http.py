@@ -1,103 +1,206 @@
 """
 Async MCP HTTP client for HealthLang AI
 """
+import asyncio
 import os
-from typing import Optional, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 import httpx
+import orjson
 
 from app.core.exceptions import MCPClientError
 from app.config import settings
+from app.utils.cache import TTLLRUCache
 
 
 MCP_BASE_URL = getattr(settings, "MCP_BASE_URL", os.getenv(
     "MCP_BASE_URL", "https://healthcare-mcp.onrender.com"
 ))
 MCP_API_KEY = getattr(settings, "MCP_API_KEY", os.getenv("MCP_API_KEY", ""))
+MCP_HEADERS: Dict[str, str] = {"X-API-Key": MCP_API_KEY} if MCP_API_KEY else {}
+
+# Shared keep-alive client; created lazily, closed on app shutdown
+_client: Optional[httpx.AsyncClient] = None
+_client_lock = asyncio.Lock()
+_request_semaphore = asyncio.Semaphore(settings.MCP_MAX_CONCURRENCY)
+
+
+async def _get_client() -> httpx.AsyncClient:
+    """Return the pooled MCP client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        async with _client_lock:
+            if _client is None or _client.is_closed:
+                _client = httpx.AsyncClient(
+                    base_url=MCP_BASE_URL,
+                    headers=MCP_HEADERS,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=50,
+                        max_connections=100,
+                    ),
+                    http2=True,
+                    timeout=settings.MCP_TIMEOUT,
+                )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the pooled MCP client (called from the app lifespan)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _request_key(
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, Tuple[Tuple[str, Any], ...]]:
+    """Hashable identity of a GET request"""
+    return endpoint, tuple(sorted((params or {}).items()))
+
+
+class MCPBatcher:
+    """
+    DataLoader-style coalescer for MCP GETs.
+
+    Concurrent callers asking for the same (endpoint, params) share one
+    in-flight HTTP call instead of each issuing their own round-trip.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, Optional[Dict[str, Any]]], Awaitable[Dict]],
+    ):
+        self._fetch = fetch
+        self._pending: Dict[Tuple, asyncio.Future] = {}
+
+    async def load(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict:
+        key = _request_key(endpoint, params)
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(endpoint, params))
+            self._pending[key] = future
+            future.add_done_callback(lambda _: self._pending.pop(key, None))
+        # Shield so one cancelled caller does not cancel its peers
+        return await asyncio.shield(future)
+
+
+async def _fetch_get(
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> Dict:
+    client = await _get_client()
+    try:
+        async with _request_semaphore:
+            resp = await client.get(endpoint, params=params)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+    except httpx.HTTPStatusError as e:
+        raise MCPClientError(
+            message=f"MCP GET {endpoint} failed: {e}",
+            status_code=e.response.status_code,
+            details={"endpoint": endpoint, "params": params},
+        ) from e
+    except httpx.RequestError as e:
+        raise MCPClientError(
+            message=f"MCP GET {endpoint} network error: {e}",
+            status_code=502,
+            details={"endpoint": endpoint, "params": params},
+        ) from e
+    except ValueError as e:  # JSON parse error (orjson.JSONDecodeError)
+        raise MCPClientError(
+            message=f"MCP GET {endpoint} unexpected error: {e}",
+            status_code=502,
+            details={"endpoint": endpoint},
+        ) from e
+
+    if isinstance(data, dict) and data.get("status") == "error":
+        raise MCPClientError(
+            message=data.get("error_message", "Unknown MCP error"),
+            status_code=502,
+            details={"endpoint": endpoint, "payload": data},
+        )
+    return data
+
+
+_batcher = MCPBatcher(_fetch_get)
+
+
+# Only reference lookups whose answers don't change minute to minute are
+# cached; health probes, searches and usage analytics always go upstream.
+# Entries are the orjson-encoded payload, so every hit decodes a private
+# copy and a caller mutating its result cannot corrupt the cache.
+_CACHEABLE_ENDPOINTS = frozenset({
+    "/api/icd10",
+    "/api/fda",
+    "/api/health-topics",
+    "/api/bookshelf",
+})
+_response_cache = TTLLRUCache(
+    maxsize=settings.CACHE_MAX_SIZE,
+    ttl=settings.CACHE_TTL,
+)
 
 
 async def mcp_get(
     endpoint: str,
     params: Optional[Dict[str, Any]] = None,
 ) -> Dict:
-    headers = {"X-API-Key": MCP_API_KEY} if MCP_API_KEY else {}
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.get(
-                f"{MCP_BASE_URL}{endpoint}",
-                params=params,
-                headers=headers,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except httpx.HTTPStatusError as e:
-            raise MCPClientError(
-                message=f"MCP GET {endpoint} failed: {e}",
-                status_code=e.response.status_code,
-                details={"endpoint": endpoint, "params": params},
-            ) from e
-        except httpx.RequestError as e:
-            raise MCPClientError(
-                message=f"MCP GET {endpoint} network error: {e}",
-                status_code=502,
-                details={"endpoint": endpoint, "params": params},
-            ) from e
-        except ValueError as e:  # JSON parse error
-            raise MCPClientError(
-                message=f"MCP GET {endpoint} unexpected error: {e}",
-                status_code=502,
-                details={"endpoint": endpoint},
-            ) from e
-
-        if isinstance(data, dict) and data.get("status") == "error":
-            raise MCPClientError(
-                message=data.get("error_message", "Unknown MCP error"),
-                status_code=502,
-                details={"endpoint": endpoint, "payload": data},
-            )
-        return data
+    if endpoint not in _CACHEABLE_ENDPOINTS:
+        return await _batcher.load(endpoint, params)
+
+    key = _request_key(endpoint, params)
+    payload = _response_cache.get(key)
+    if payload is None:
+        # Errors raise MCPClientError, so only successful payloads are
+        # stored. Coalesced callers share ``data``; each re-decodes below.
+        data = await _batcher.load(endpoint, params)
+        payload = orjson.dumps(data)
+        _response_cache.set(key, payload)
+    return orjson.loads(payload)
 
 
 async def mcp_post(
     endpoint: str,
     json: Optional[Dict[str, Any]] = None,
 ) -> Dict:
-    headers = {"X-API-Key": MCP_API_KEY} if MCP_API_KEY else {}
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.post(
-                f"{MCP_BASE_URL}{endpoint}",
-                json=json,
-                headers=headers,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except httpx.HTTPStatusError as e:
-            raise MCPClientError(
-                message=f"MCP POST {endpoint} failed: {e}",
-                status_code=e.response.status_code,
-                details={"endpoint": endpoint, "json": json},
-            ) from e
-        except httpx.RequestError as e:
-            raise MCPClientError(
-                message=f"MCP POST {endpoint} network error: {e}",
-                status_code=502,
-                details={"endpoint": endpoint, "json": json},
-            ) from e
-        except ValueError as e:
-            raise MCPClientError(
-                message=f"MCP POST {endpoint} unexpected error: {e}",
-                status_code=502,
-                details={"endpoint": endpoint},
-            ) from e
-
-        if isinstance(data, dict) and data.get("status") == "error":
-            raise MCPClientError(
-                message=data.get("error_message", "Unknown MCP error"),
-                status_code=502,
-                details={"endpoint": endpoint, "payload": data},
-            )
-        return data
+    client = await _get_client()
+    try:
+        async with _request_semaphore:
+            resp = await client.post(endpoint, json=json)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+    except httpx.HTTPStatusError as e:
+        raise MCPClientError(
+            message=f"MCP POST {endpoint} failed: {e}",
+            status_code=e.response.status_code,
+            details={"endpoint": endpoint, "json": json},
+        ) from e
+    except httpx.RequestError as e:
+        raise MCPClientError(
+            message=f"MCP POST {endpoint} network error: {e}",
+            status_code=502,
+            details={"endpoint": endpoint, "json": json},
+        ) from e
+    except ValueError as e:
+        raise MCPClientError(
+            message=f"MCP POST {endpoint} unexpected error: {e}",
+            status_code=502,
+            details={"endpoint": endpoint},
+        ) from e
+
+    if isinstance(data, dict) and data.get("status") == "error":
+        raise MCPClientError(
+            message=data.get("error_message", "Unknown MCP error"),
+            status_code=502,
+            details={"endpoint": endpoint, "payload": data},
+        )
+    return data
 
 
 # Tool-specific wrappers
@@ -0,0 +1,149 @@
+"""
+LLM Response Cache
+
+Exact-match cache for deterministic LLM generations, keyed by everything
+that influences the completion. An in-process LRU always sits in front;
+with LLM_CACHE_BACKEND="redis" entries are also shared through Redis as
+msgpack payloads.
+"""
+
+import dataclasses
+import hashlib
+import zlib
+from typing import TYPE_CHECKING, Any, Optional
+
+import orjson
+
+from app.config import settings
+from app.utils.cache import TTLLRUCache
+from app.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from app.services.medical.llm_client import LLMRequest, LLMResponse
+
+logger = get_logger(__name__)
+
+# Above this temperature repeated prompts are expected to differ
+CACHEABLE_MAX_TEMPERATURE = 0.2
+
+# Redis payloads larger than this are zlib-compressed
+_COMPRESS_MIN_BYTES = 4096
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+
+
+def _pack_response(response: "LLMResponse") -> bytes:
+    """msgpack an LLMResponse, compressing long completions"""
+    import msgpack
+
+    packed = msgpack.packb(dataclasses.asdict(response), use_bin_type=True)
+    if len(packed) > _COMPRESS_MIN_BYTES:
+        return _ZLIB + zlib.compress(packed)
+    return _RAW + packed
+
+
+def _unpack_response(raw: bytes) -> "LLMResponse":
+    import msgpack
+
+    from app.services.medical.llm_client import LLMResponse
+
+    body = raw[1:]
+    if raw[:1] == _ZLIB:
+        body = zlib.decompress(body)
+    return LLMResponse(**msgpack.unpackb(body, raw=False))
+
+
+class LLMCache:
+    """Cache of LLM responses for low-temperature, non-stream calls"""
+
+    def __init__(self, maxsize: int, ttl: float, redis_url: Optional[str] = None):
+        self._store = TTLLRUCache(maxsize=maxsize, ttl=ttl)
+        self._ttl = int(ttl)
+        self._redis: Any = None
+        if redis_url:
+            import redis.asyncio as redis_asyncio
+
+            self._redis = redis_asyncio.from_url(redis_url)
+
+    @staticmethod
+    def is_cacheable(request: "LLMRequest") -> bool:
+        """Only near-deterministic, buffered generations are worth reusing"""
+        return (
+            not request.stream
+            and request.temperature <= CACHEABLE_MAX_TEMPERATURE
+        )
+
+    @staticmethod
+    def make_key(provider: str, model: str, request: "LLMRequest") -> str:
+        """sha256 over the provider, model and every sampling input"""
+        material = orjson.dumps(
+            {
+                "provider": provider,
+                "model": model,
+                "system_prompt": request.system_prompt,
+                "cacheable_prefix": request.cacheable_prefix,
+                "prompt": request.prompt,
+                "max_tokens": request.max_tokens,
+                "temperature": request.temperature,
+                "top_p": request.top_p,
+                "stop_sequences": request.stop_sequences,
+            },
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.sha256(material).hexdigest()
+
+    async def get(self, key: str) -> Optional["LLMResponse"]:
+        cached = self._store.get(key)
+        if cached is None and self._redis is not None:
+            try:
+                raw = await self._redis.get(f"llm:{key}")
+                if raw:
+                    cached = _unpack_response(raw)
+                    self._store.set(key, cached)
+            except Exception as e:
+                logger.warning(f"LLM cache Redis get failed: {e}")
+        # Hand out a copy so callers can stamp response_time on it
+        return dataclasses.replace(cached) if cached is not None else None
+
+    async def set(self, key: str, response: "LLMResponse") -> None:
+        self._store.set(key, dataclasses.replace(response))
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    f"llm:{key}", _pack_response(response), ex=self._ttl
+                )
+            except Exception as e:
+                logger.warning(f"LLM cache Redis set failed: {e}")
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+
+# Shared across LLMClient instances
+_llm_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Get the process-wide LLM response cache"""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMCache(
+            maxsize=settings.CACHE_MAX_SIZE,
+            ttl=settings.LLM_CACHE_TTL,
+            redis_url=(
+                settings.REDIS_URL
+                if settings.LLM_CACHE_BACKEND == "redis"
+                else None
+            ),
+        )
+    return _llm_cache
+
+
+async def close_llm_cache() -> None:
+    """Release the Redis connection pool, if one was opened"""
+    if _llm_cache is not None:
+        await _llm_cache.close()
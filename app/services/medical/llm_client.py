@@ -4,25 +4,213 @@ LLM Client Service
 This module provides a client for interfacing with Groq LLM provider.
 """
 
+import asyncio
+import functools
+import random
 import time
-from typing import Dict, List, Optional, Any
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union,
+)
 from dataclasses import dataclass
 from enum import Enum
 
 import httpx
+import orjson
 from groq import AsyncGroq
 from loguru import logger
 
 from app.config import settings
 from app.core.exceptions import LLMServiceError
-from app.utils.metrics import record_llm_metrics
+from app.services.medical.llm_cache import LLMCache, get_llm_cache
+from app.utils.metrics import observe_llm_metrics, observe_cache_metrics
+
+# Shared HTTP/2 client for the local OpenAI-compatible endpoint
+_local_client: Optional[httpx.AsyncClient] = None
+_local_client_lock = asyncio.Lock()
+_local_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONNECTIONS)
+
+# Transient provider failures worth retrying, and the backoff envelope
+_RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+_RETRY_INITIAL_DELAY = 0.5
+_RETRY_MAX_DELAY = 8.0
+
+# Request bodies are pre-encoded with orjson, so the type is set by hand
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Minimum characters buffered before streaming_generate yields a chunk
+_STREAM_FLUSH_CHARS = 64
+
+# (epoch second, formatted) memo so health checks format at most once a second
+_timestamp_memo: Tuple[int, str] = (0, "")
+
+
+def _health_timestamp() -> str:
+    """Current local time as an ISO string, reformatted once per second"""
+    global _timestamp_memo
+    now = int(time.time())
+    if now != _timestamp_memo[0]:
+        _timestamp_memo = (
+            now,
+            time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now)),
+        )
+    return _timestamp_memo[1]
+
+
+def _http_timeout() -> httpx.Timeout:
+    """LLM_TIMEOUT for reads/writes with a short connect timeout"""
+    return httpx.Timeout(settings.LLM_TIMEOUT, connect=10.0)
+
+
+def _new_http_client() -> httpx.AsyncClient:
+    """Keep-alive HTTP/2 client sized by the LLM pool settings"""
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=_http_timeout(),
+        limits=httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE,
+        ),
+    )
+
+
+def _retry_delay(attempt: int, error: Exception) -> Optional[float]:
+    """Seconds to wait before retrying ``error``, or None if it is permanent"""
+    if isinstance(error, httpx.HTTPStatusError):
+        if error.response.status_code not in _RETRYABLE_STATUS:
+            return None
+        retry_after = error.response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(float(retry_after), _RETRY_MAX_DELAY)
+            except ValueError:
+                pass
+    elif not isinstance(error, httpx.TransportError):
+        return None
+    backoff = _RETRY_INITIAL_DELAY * (2 ** attempt) + random.uniform(0, 1)
+    return min(backoff, _RETRY_MAX_DELAY)
+
+
+async def _send_with_retries(
+    send: Callable[[], Awaitable[httpx.Response]],
+) -> httpx.Response:
+    """Call ``send`` until it succeeds, retrying transient errors with backoff"""
+    for attempt in range(settings.LLM_MAX_RETRIES + 1):
+        try:
+            response = await send()
+            response.raise_for_status()
+            return response
+        except (httpx.HTTPStatusError, httpx.TransportError) as e:
+            delay = _retry_delay(attempt, e)
+            if delay is None or attempt == settings.LLM_MAX_RETRIES:
+                raise
+            logger.warning(
+                f"Transient LLM HTTP error ({e}); retry {attempt + 1} "
+                f"in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+async def _get_local_client() -> httpx.AsyncClient:
+    """Return the pooled local-model client, creating it on first use"""
+    global _local_client
+    if _local_client is None or _local_client.is_closed:
+        async with _local_client_lock:
+            if _local_client is None or _local_client.is_closed:
+                _local_client = _new_http_client()
+    return _local_client
+
+
+class _TokenBucket:
+    """
+    Async token bucket refilled continuously at ``per_minute`` per minute.
+    
+    Waiters are served in arrival order. ``consume`` may drive the balance
+    negative (e.g. tokens reported after a completion), which delays the
+    next ``acquire`` until it has been paid back.
+    """
+
+    def __init__(self, per_minute: int):
+        self._capacity = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= amount
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self._tokens -= amount
+
+
+# Shared by every LLMClient, since the quota is per API key
+_groq_rpm = _TokenBucket(settings.GROQ_RPM) if settings.GROQ_RPM > 0 else None
+_groq_tpm = _TokenBucket(settings.GROQ_TPM) if settings.GROQ_TPM > 0 else None
+
+
+async def _throttle(provider: "LLMProvider") -> None:
+    """Wait for request and token budget before calling a rate-limited provider"""
+    if provider != LLMProvider.GROQ:
+        return
+    if _groq_rpm is not None:
+        await _groq_rpm.acquire()
+    if _groq_tpm is not None:
+        await _groq_tpm.acquire(0)
+
+
+# Process-wide Groq client; every LLMClient shares its connection pool
+_groq_client: Optional[AsyncGroq] = None
+
+
+def _get_groq_client() -> AsyncGroq:
+    """Return the shared AsyncGroq client, creating it on first use"""
+    global _groq_client
+    if _groq_client is None:
+        _groq_client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            max_retries=settings.LLM_MAX_RETRIES,
+            timeout=_http_timeout(),
+            http_client=_new_http_client(),
+        )
+    return _groq_client
+
+
+async def close_http_clients() -> None:
+    """Close pooled LLM HTTP clients (called from the app lifespan)"""
+    global _local_client, _groq_client
+    if _local_client is not None:
+        await _local_client.aclose()
+        _local_client = None
+    if _groq_client is not None:
+        await _groq_client.close()
+        _groq_client = None
+
 
 class LLMProvider(str, Enum):
     """Supported LLM providers."""
     GROQ = "groq"
     LOCAL = "local"
 
-@dataclass
+@functools.lru_cache(maxsize=8)
+def _coerce_provider(provider: str) -> LLMProvider:
+    """Map a provider name to its enum member (cached per distinct value)"""
+    return LLMProvider(provider)
+
+@dataclass(slots=True)
 class LLMRequest:
     prompt: str
     system_prompt: Optional[str] = None
@@ -34,8 +222,12 @@ class LLMRequest:
     stop_sequences: Optional[List[str]] = None
     stream: bool = False
     model: Optional[str] = None
+    # Invariant instructions/examples shared across calls. Sent right after
+    # the system prompt so providers with automatic prefix caching can reuse
+    # it; keep per-query data in ``prompt``.
+    cacheable_prefix: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     content: str
     model: str
@@ -44,33 +236,138 @@ class LLMResponse:
     response_time: float
     provider: str
 
+def _build_messages(request: LLMRequest) -> List[Dict[str, str]]:
+    """
+    Chat messages for a request, static content first: system prompt, then
+    the cacheable prefix, then the per-query user turn.
+    """
+    messages = []
+    if request.system_prompt:
+        messages.append({"role": "system", "content": request.system_prompt})
+    if request.cacheable_prefix:
+        messages.append({"role": "user", "content": request.cacheable_prefix})
+    messages.append({"role": "user", "content": request.prompt})
+    return messages
+
+def _parse_completion(body: bytes, provider: LLMProvider) -> LLMResponse:
+    """
+    Build an LLMResponse from an OpenAI-style completion body.
+    
+    Only the first choice, model and usage are kept; the rest of the parsed
+    tree (extra choices, logprobs, tool metadata) is released on return
+    rather than living as long as the caller's frame.
+    """
+    data = orjson.loads(body)
+    choice = data["choices"][0]
+    return LLMResponse(
+        content=choice["message"]["content"],
+        model=data["model"],
+        usage=data["usage"],
+        finish_reason=choice["finish_reason"],
+        response_time=0.0,
+        provider=provider.value
+    )
+
+def _chat_payload(request: LLMRequest, model: str, stream: bool) -> Dict[str, Any]:
+    """OpenAI-compatible chat completion body"""
+    return {
+        "model": model,
+        "messages": _build_messages(request),
+        "max_tokens": request.max_tokens,
+        "temperature": request.temperature,
+        "top_p": request.top_p,
+        "frequency_penalty": request.frequency_penalty,
+        "presence_penalty": request.presence_penalty,
+        "stop": request.stop_sequences,
+        "stream": stream
+    }
+
+async def _openai_chat(
+    client: httpx.AsyncClient,
+    url: str,
+    model: str,
+    request: LLMRequest,
+    provider: LLMProvider,
+    headers: Dict[str, str] = _JSON_HEADERS,
+) -> LLMResponse:
+    """POST a chat completion to an OpenAI-compatible server (with retries)"""
+    body = orjson.dumps(_chat_payload(request, model, stream=False))
+    response = await _send_with_retries(
+        lambda: client.post(
+            url,
+            content=body,
+            headers=headers,
+        )
+    )
+    return _parse_completion(response.content, provider)
+
+async def _openai_chat_stream(
+    client: httpx.AsyncClient,
+    url: str,
+    model: str,
+    request: LLMRequest,
+    headers: Dict[str, str] = _JSON_HEADERS,
+) -> AsyncIterator[str]:
+    """Yield content deltas from OpenAI-style SSE frames (``data: {...}``)"""
+    async with client.stream(
+        "POST",
+        url,
+        content=orjson.dumps(_chat_payload(request, model, stream=True)),
+        headers=headers,
+    ) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            choices = orjson.loads(data).get("choices")
+            if choices:
+                content = choices[0].get("delta", {}).get("content")
+                if content:
+                    yield content
+
 class LLMClient:
     async def health_check(self) -> dict:
         """Dummy health check for LLMClient."""
         return {
             "status": "healthy",
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "timestamp": _health_timestamp(),
             "provider": str(self.provider)
         }
     """
     Client for interfacing with Groq LLM provider.
     """
     def __init__(self):
-        self.provider = LLMProvider(settings.LLM_PROVIDER) if not isinstance(settings.LLM_PROVIDER, LLMProvider) else settings.LLM_PROVIDER
+        self.provider = _coerce_provider(settings.LLM_PROVIDER)
         self.clients: Dict[LLMProvider, Any] = {}
         self.models: Dict[LLMProvider, str] = {
             LLMProvider.GROQ: settings.GROQ_MODEL,
             LLMProvider.LOCAL: settings.LOCAL_MODEL
         }
+        self._cache = get_llm_cache()
         self._initialize_clients()
 
+    def _resolve_provider(self, provider: Optional[LLMProvider]) -> LLMProvider:
+        """Return the requested provider as an enum, defaulting to self.provider"""
+        if not provider:
+            return self.provider
+        if type(provider) is LLMProvider:
+            return provider
+        return _coerce_provider(provider)
+
     def _initialize_clients(self):
         try:
             if settings.GROQ_API_KEY:
-                self.clients[LLMProvider.GROQ] = AsyncGroq(api_key=settings.GROQ_API_KEY)
+                self.clients[LLMProvider.GROQ] = _get_groq_client()
                 logger.info("Groq client initialized")
             if settings.LOCAL_MODEL_ENDPOINT:
-                self.clients[LLMProvider.LOCAL] = settings.LOCAL_MODEL_ENDPOINT
+                endpoint = settings.LOCAL_MODEL_ENDPOINT
+                self.clients[LLMProvider.LOCAL] = endpoint
+                # Built once; the hot path only passes these through
+                self._local_chat_url = f"{endpoint}/v1/chat/completions"
+                self._local_models_url = f"{endpoint}/v1/models"
                 logger.info("Local model client initialized")
         except Exception as e:
             logger.error(f"Failed to initialize LLM clients: {e}")
@@ -79,35 +376,76 @@ class LLMClient:
                 provider=str(self.provider)
             ) from e
 
+    async def warmup(self, timeout: float = 5.0) -> None:
+        """
+        Open keep-alive connections to each configured provider so the first
+        real request skips the TCP/TLS handshake. Failures are only logged.
+        """
+        async def _warm(provider: LLMProvider) -> str:
+            """Issue a cheap request and return the negotiated HTTP version"""
+            if provider == LLMProvider.GROQ:
+                raw = await self.clients[
+                    LLMProvider.GROQ
+                ].models.with_raw_response.list()
+                return raw.http_response.http_version
+            client = await _get_local_client()
+            response = await client.get(self._local_models_url)
+            return response.http_version
+
+        async def _warm_one(provider: LLMProvider) -> None:
+            try:
+                http_version = await asyncio.wait_for(_warm(provider), timeout)
+                logger.info(
+                    f"Warmed up {provider.value} connection ({http_version})"
+                )
+            except Exception as e:
+                logger.warning(f"Warmup for {provider.value} failed: {e}")
+
+        await asyncio.gather(*(_warm_one(p) for p in self.clients))
+
     async def generate(
         self, 
         request: LLMRequest,
         provider: Optional[LLMProvider] = None
     ) -> LLMResponse:
-        provider = LLMProvider(provider) if provider and not isinstance(provider, LLMProvider) else (provider or self.provider)
-        start_time = time.time()
+        provider = self._resolve_provider(provider)
+        model = request.model or self.models[provider]
+        cache_key = None
+        if settings.LLM_CACHE_ENABLED and LLMCache.is_cacheable(request):
+            cache_key = LLMCache.make_key(provider.value, model, request)
+            cached = await self._cache.get(cache_key)
+            observe_cache_metrics("llm", hit=cached is not None)
+            if cached is not None:
+                logger.debug(f"LLM cache hit for {provider}")
+                return cached
+        await _throttle(provider)
+        start_time = time.perf_counter()
         try:
             if provider == LLMProvider.GROQ:
-                response = await self._generate_groq(request)
+                response = await self._generate_groq(request, model)
             elif provider == LLMProvider.LOCAL:
-                response = await self._generate_local(request)
+                response = await self._generate_local(request, model)
             else:
                 raise LLMServiceError(
                     f"Unsupported provider: {provider}",
                     provider=str(provider)
                 )
-            response_time = time.time() - start_time
+            response_time = time.perf_counter() - start_time
             response.response_time = response_time
             # Record LLM metrics
             tokens_used = response.usage.get("total_tokens", 0)
-            await record_llm_metrics(
+            if provider == LLMProvider.GROQ and _groq_tpm is not None:
+                _groq_tpm.consume(tokens_used)
+            observe_llm_metrics(
                 request_id="llm",
-                model=request.model or self.models[provider],
+                model=model,
                 provider=provider.value,
                 duration=response_time,
                 success=True,
                 tokens_used=tokens_used
             )
+            if cache_key is not None:
+                await self._cache.set(cache_key, response)
             logger.info(f"LLM generation completed in {response_time:.2f}s using {provider}")
             return response
         except Exception as e:
@@ -117,38 +455,81 @@ class LLMClient:
                 provider=str(provider)
             ) from e
 
+    async def generate_batch(
+        self,
+        requests: List[LLMRequest],
+        provider: Optional[LLMProvider] = None,
+        max_concurrency: int = 16,
+    ) -> List[Union[LLMResponse, LLMServiceError]]:
+        """
+        Run independent generations concurrently, at most
+        ``max_concurrency`` in flight.
+        
+        Results keep the order of ``requests``; a failed item is returned as
+        its LLMServiceError instead of aborting the whole batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _one(request: LLMRequest) -> LLMResponse:
+            async with semaphore:
+                return await self.generate(request, provider)
+
+        return await asyncio.gather(
+            *(_one(request) for request in requests),
+            return_exceptions=True,
+        )
+
+    async def generate_chain(
+        self,
+        steps: List[Callable[[List[Any]], Union[LLMRequest, List[LLMRequest]]]],
+        provider: Optional[LLMProvider] = None,
+    ) -> List[Any]:
+        """
+        Run dependent generations back to back over the pooled connection.
+
+        Each step receives the results gathered so far and returns the next
+        LLMRequest, or a list of independent requests that is fanned out
+        through generate_batch (its result is then a list, as there).
+        """
+        provider = self._resolve_provider(provider)
+        results: List[Any] = []
+        for step in steps:
+            next_request = step(results)
+            if isinstance(next_request, list):
+                results.append(await self.generate_batch(next_request, provider))
+            else:
+                results.append(await self.generate(next_request, provider))
+        return results
+
     async def streaming_generate(
         self,
         request: LLMRequest,
         provider: Optional[LLMProvider] = None
     ):
-        """Stream LLM response chunks. Only supported for Groq."""
-        provider = LLMProvider(provider) if provider and not isinstance(provider, LLMProvider) else (provider or self.provider)
+        """Stream LLM response chunks as they arrive (Groq or local endpoint)."""
+        provider = self._resolve_provider(provider)
         
-        if provider != LLMProvider.GROQ:
+        await _throttle(provider)
+        if provider == LLMProvider.GROQ:
+            deltas = self._stream_groq(request)
+        elif provider == LLMProvider.LOCAL:
+            deltas = self._stream_local(request)
+        else:
             raise LLMServiceError(f"Streaming not supported for provider: {provider}")
         
         try:
-            client = self.clients[LLMProvider.GROQ]
-            model = request.model or self.models[LLMProvider.GROQ]
-            
-            messages = []
-            if request.system_prompt:
-                messages.append({"role": "system", "content": request.system_prompt})
-            messages.append({"role": "user", "content": request.prompt})
-            
-            stream = await client.chat.completions.create(
-                model=model,
-                messages=messages,
-                max_tokens=request.max_tokens,
-                temperature=request.temperature,
-                top_p=request.top_p,
-                stream=True
-            )
-            
-            async for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+            # Coalesce token deltas into ~64-char pieces to cut yield hops
+            buffer: List[str] = []
+            buffered = 0
+            async for content in deltas:
+                buffer.append(content)
+                buffered += len(content)
+                if buffered >= _STREAM_FLUSH_CHARS:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    buffered = 0
+            if buffer:
+                yield "".join(buffer)
                     
         except Exception as e:
             logger.error(f"Streaming generation failed: {e}")
@@ -157,65 +538,64 @@ class LLMClient:
                 provider=str(provider)
             ) from e
 
-    async def _generate_groq(self, request: LLMRequest) -> LLMResponse:
+    async def _stream_groq(self, request: LLMRequest) -> AsyncIterator[str]:
         client = self.clients[LLMProvider.GROQ]
         model = request.model or self.models[LLMProvider.GROQ]
-        messages = []
-        if request.system_prompt:
-            messages.append({"role": "system", "content": request.system_prompt})
-        messages.append({"role": "user", "content": request.prompt})
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=_build_messages(request),
+            max_tokens=request.max_tokens,
+            temperature=request.temperature,
+            top_p=request.top_p,
+            stream=True
+        )
+        async for chunk in stream:
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+
+    async def _stream_local(self, request: LLMRequest) -> AsyncIterator[str]:
+        client = await _get_local_client()
+        model = request.model or self.models[LLMProvider.LOCAL]
+        async with _local_semaphore:
+            async for content in _openai_chat_stream(
+                client, self._local_chat_url, model, request
+            ):
+                yield content
+
+    async def _generate_groq(self, request: LLMRequest, model: str) -> LLMResponse:
+        client = self.clients[LLMProvider.GROQ]
+        messages = _build_messages(request)
         response = await client.chat.completions.create(
             model=model,
             messages=messages,
             max_tokens=request.max_tokens,
             temperature=request.temperature,
             top_p=request.top_p,
-            stream=request.stream
+            stream=False
         )
+        choice = response.choices[0]
+        usage = response.usage
         return LLMResponse(
-            content=response.choices[0].message.content,
+            content=choice.message.content,
             model=response.model,
             usage={
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens
             },
-            finish_reason=response.choices[0].finish_reason,
+            finish_reason=choice.finish_reason,
             response_time=0.0,
             provider=LLMProvider.GROQ.value
         )
 
-    async def _generate_local(self, request: LLMRequest) -> LLMResponse:
-        endpoint = self.clients[LLMProvider.LOCAL]
-        model = request.model or self.models[LLMProvider.LOCAL]
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": request.system_prompt} if request.system_prompt else None,
-                {"role": "user", "content": request.prompt}
-            ],
-            "max_tokens": request.max_tokens,
-            "temperature": request.temperature,
-            "top_p": request.top_p,
-            "frequency_penalty": request.frequency_penalty,
-            "presence_penalty": request.presence_penalty,
-            "stop": request.stop_sequences,
-            "stream": request.stream
-        }
-        payload["messages"] = [msg for msg in payload["messages"] if msg is not None]
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{endpoint}/v1/chat/completions",
-                json=payload,
-                timeout=settings.LLM_TIMEOUT
+    async def _generate_local(self, request: LLMRequest, model: str) -> LLMResponse:
+        client = await _get_local_client()
+        async with _local_semaphore:
+            return await _openai_chat(
+                client,
+                self._local_chat_url,
+                model,
+                request,
+                LLMProvider.LOCAL,
             )
-            response.raise_for_status()
-            data = response.json()
-        return LLMResponse(
-            content=data["choices"][0]["message"]["content"],
-            model=data["model"],
-            usage=data["usage"],
-            finish_reason=data["choices"][0]["finish_reason"],
-            response_time=0.0,
-            provider=LLMProvider.LOCAL.value
-        )
@@ -5,21 +5,81 @@ This module provides medical analysis and reasoning capabilities using LLMs
 with specialized medical prompts, safety checks, and structured output.
 """
 
+import asyncio
+import hashlib
 import json
 import re
-from typing import Dict, List, Optional, Any, Union
+import time
+from types import MappingProxyType
+from typing import (
+    Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional,
+    Tuple, Union,
+)
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import StrEnum
 
 from loguru import logger
 
 from app.config import settings
 from app.core.exceptions import MedicalAnalysisError, SafetyCheckError
 from app.services.medical.llm_client import LLMClient, LLMRequest
+from app.utils.cache import TTLLRUCache
 from app.utils.metrics import record_medical_analysis, record_safety_check
 
-
-class MedicalQueryType(str, Enum):
+# Sentence boundaries used by the response extractors
+_SENT_SPLIT = re.compile(r'[.!?]')
+
+_DISCLAIMER_KWS = (
+    'disclaimer', 'important', 'note', 'warning', 'caution',
+    'consult', 'professional', 'medical advice', 'limitation'
+)
+
+_EMERGENCY_PHRASES = (
+    'seek immediate', 'emergency', 'urgent', 'call 911',
+    'go to hospital', 'emergency room', 'immediate attention'
+)
+
+# One pass per sentence tags it as disclaimer and/or emergency. The
+# zero-width lookahead reports hits at every offset, so overlapping
+# keywords from both groups are all seen.
+_CLASSIFY_RE = re.compile(
+    "(?=(?P<disclaimer>" + "|".join(map(re.escape, _DISCLAIMER_KWS)) + ")"
+    "|(?P<emergency>" + "|".join(map(re.escape, _EMERGENCY_PHRASES)) + "))"
+)
+
+# Bulleted/numbered lines that contain a recommendation verb
+_REC_RE = re.compile(
+    r'^[^\S\n]*((?:[•*-]|[123]\.).*?'
+    r'(?:recommend|should|consider|seek|consult).*)$',
+    re.IGNORECASE | re.MULTILINE,
+)
+# Bullet/numbering characters stripped from the front of a recommendation
+_REC_STRIP_CHARS = '•-*123456789. '
+
+# Shorter "questions" are usually list fragments, not real follow-ups
+_FOLLOWUP_MIN_LEN = 10
+
+# Response-quality signals used by _calculate_confidence_score
+_STRUCTURE_MARKERS = ('1.', '2.', '3.', '•', '-')
+_CONSULT_WORDS = ('consult', 'professional', 'medical advice')
+_RECOMMEND_WORDS = ('recommend', 'should', 'consider')
+_SAFETY_WORDS = ('safety', 'emergency', 'urgent')
+
+# Owner-cancelled marker for _cached_call waiters: recompute, don't fail
+_RECOMPUTE = object()
+
+# Whole-message pleasantries that skip the LLM safety assessment. This is
+# an allowlist on purpose: a symptom stem blocklist misses phrasings like
+# "I cut myself" or "my kid swallowed a battery", so anything not matched
+# here goes to the LLM.
+_NON_CLINICAL_RE = re.compile(
+    r'(?:hi|hello|hey|good (?:morning|afternoon|evening)|'
+    r'thanks|thank you|ok|okay|bye|goodbye)'
+    r'(?: (?:there|so much|a lot|again|doctor|doc))?[\s!.,?]*'
+)
+
+
+class MedicalQueryType(StrEnum):
     """Types of medical queries."""
     SYMPTOM_ANALYSIS = "symptom_analysis"
     MEDICATION_INFO = "medication_info"
@@ -30,7 +90,7 @@ class MedicalQueryType(str, Enum):
     GENERAL_QUESTION = "general_question"
 
 
-class SafetyLevel(str, Enum):
+class SafetyLevel(StrEnum):
     """Safety levels for medical responses."""
     SAFE = "safe"
     CAUTION = "caution"
@@ -38,84 +98,74 @@ class SafetyLevel(str, Enum):
     EMERGENCY = "emergency"
 
 
-@dataclass
-class MedicalAnalysisRequest:
-    """Medical analysis request."""
-    query: str
-    query_type: MedicalQueryType
-    language: str = "en"
-    context: Optional[Dict[str, Any]] = None
-    user_age: Optional[int] = None
-    user_gender: Optional[str] = None
-    existing_conditions: Optional[List[str]] = None
-    medications: Optional[List[str]] = None
-    symptoms_duration: Optional[str] = None
-    severity_level: Optional[str] = None
-
-
-@dataclass
-class MedicalAnalysisResponse:
-    """Medical analysis response."""
-    analysis: str
-    recommendations: List[str]
-    safety_level: SafetyLevel
-    confidence_score: float
-    query_type: MedicalQueryType
-    disclaimers: List[str] = field(default_factory=list)
-    follow_up_questions: List[str] = field(default_factory=list)
-    emergency_indicators: List[str] = field(default_factory=list)
-    sources: List[str] = field(default_factory=list)
-    structured_data: Dict[str, Any] = field(default_factory=dict)
-
-
-class MedicalAnalyzer:
-    """
-    Medical analysis service using LLMs with safety checks and structured output.
-    
-    Provides medical reasoning, symptom analysis, and safety assessments.
-    """
-    
-    def __init__(self, llm_client: LLMClient):
-        """
-        Initialize medical analyzer.
-        
-        Args:
-            llm_client: LLM client for medical reasoning
-        """
-        self.llm_client = llm_client
-        self.safety_keywords = self._load_safety_keywords()
-        self.emergency_keywords = self._load_emergency_keywords()
-        self.medical_prompts = self._load_medical_prompts()
-        
-    def _load_safety_keywords(self) -> Dict[str, List[str]]:
-        """Load safety-related keywords for different categories."""
-        return {
-            "emergency": [
-                "chest pain", "heart attack", "stroke", "severe bleeding",
-                "unconscious", "difficulty breathing", "severe injury",
-                "poisoning", "overdose", "suicidal", "homicidal"
-            ],
-            "urgent": [
-                "high fever", "severe pain", "sudden onset", "worsening",
-                "cannot function", "severe symptoms", "rapid deterioration"
-            ],
-            "caution": [
-                "persistent", "chronic", "recurring", "unusual",
-                "new symptoms", "changes", "concerned"
-            ]
-        }
-    
-    def _load_emergency_keywords(self) -> List[str]:
-        """Load emergency-specific keywords."""
-        return [
-            "emergency", "urgent", "immediate", "critical", "severe",
-            "life-threatening", "dangerous", "serious", "acute"
-        ]
-    
-    def _load_medical_prompts(self) -> Dict[str, str]:
-        """Load specialized medical prompts for different query types."""
-        return {
-            MedicalQueryType.SYMPTOM_ANALYSIS: """
+# Levels that get the "seek immediate attention" disclaimer
+_HIGH_SEVERITY = frozenset({SafetyLevel.URGENT, SafetyLevel.EMERGENCY})
+
+# One-word LLM safety answers ("SAFE", "URGENT", ...) to levels
+_SAFETY_STR_TO_LEVEL = {level.value.upper(): level for level in SafetyLevel}
+
+
+# Safety and disclaimer instructions appended to the global persona
+_ANALYSIS_INSTRUCTIONS = (
+    "You are a medical AI assistant. Provide helpful, "
+    "evidence-based medical information while:\n\n"
+    "1. Always emphasize consulting healthcare providers for "
+    "specific medical advice\n"
+    "2. Include appropriate disclaimers about the limitations of "
+    "AI medical advice\n"
+    "3. Prioritize safety and recommend medical attention when "
+    "appropriate\n"
+    "4. Provide structured, clear responses\n"
+    "5. Acknowledge when symptoms require immediate medical "
+    "attention\n\n"
+    "Your responses should be educational and supportive, not "
+    "diagnostic or prescriptive."
+)
+
+# Canned answer for hard emergency keyword hits; no LLM call is made
+_EMERGENCY_ANALYSIS = (
+    "Your message describes symptoms that can indicate a medical "
+    "emergency. Call your local emergency number (e.g. 911) or go to the "
+    "nearest emergency department now. Do not wait to see whether the "
+    "symptoms improve."
+)
+_EMERGENCY_RECOMMENDATIONS = (
+    "Call emergency services or go to the nearest emergency room immediately",
+    "Do not drive yourself if you feel faint, confused or short of breath",
+    "Stay with someone and keep your phone nearby while waiting for help",
+    "If you took a substance or medication, bring the packaging with you",
+)
+
+
+# Keyword tables, shared read-only by every MedicalAnalyzer
+_SAFETY_KEYWORDS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "emergency": (
+        "chest pain", "heart attack", "stroke", "severe bleeding",
+        "unconscious", "difficulty breathing", "severe injury",
+        "poisoning", "overdose", "suicidal", "homicidal"
+    ),
+    "urgent": (
+        "high fever", "severe pain", "sudden onset", "worsening",
+        "cannot function", "severe symptoms", "rapid deterioration"
+    ),
+    "caution": (
+        "persistent", "chronic", "recurring", "unusual",
+        "new symptoms", "changes", "concerned"
+    ),
+})
+_EMERGENCY_KEYWORDS: Tuple[str, ...] = (
+    "emergency", "urgent", "immediate", "critical", "severe",
+    "life-threatening", "dangerous", "serious", "acute",
+)
+# Only the curated emergency phrases skip the LLM; the generic keywords
+# above ("acute", "serious", ...) still raise the safety level but are
+# too common in ordinary questions to replace the analysis
+_CANNED_EMERGENCY_SOURCE = "emergency_category"
+
+# Specialized prompts per query type; {query} and {context} are filled
+# from the pre-split parts
+_MEDICAL_PROMPTS: Mapping[str, str] = MappingProxyType({
+    MedicalQueryType.SYMPTOM_ANALYSIS: """
 You are a medical AI assistant. Analyze the following symptoms and provide:
 1. Possible causes (most likely to least likely)
 2. Recommended next steps
@@ -128,7 +178,7 @@ Context: {context}
 
 Provide your analysis in a structured, professional manner. Always prioritize safety and recommend medical consultation when appropriate.
 """,
-            MedicalQueryType.MEDICATION_INFO: """
+    MedicalQueryType.MEDICATION_INFO: """
 You are a medical AI assistant. Provide information about the following medication:
 1. What it's used for
 2. Common side effects
@@ -142,7 +192,7 @@ Context: {context}
 
 Provide accurate, evidence-based information while emphasizing the importance of consulting healthcare providers for personalized advice.
 """,
-            MedicalQueryType.TREATMENT_OPTIONS: """
+    MedicalQueryType.TREATMENT_OPTIONS: """
 You are a medical AI assistant. Discuss treatment options for the following condition:
 1. Available treatment approaches
 2. Benefits and risks of each option
@@ -156,7 +206,7 @@ Context: {context}
 
 Provide balanced information while emphasizing that treatment decisions should be made with healthcare providers.
 """,
-            MedicalQueryType.DIAGNOSIS_HELP: """
+    MedicalQueryType.DIAGNOSIS_HELP: """
 You are a medical AI assistant. Help understand the following condition:
 1. What the condition involves
 2. Common symptoms and presentations
@@ -170,7 +220,7 @@ Context: {context}
 
 Provide educational information while making it clear that actual diagnosis requires professional medical evaluation.
 """,
-            MedicalQueryType.PREVENTIVE_CARE: """
+    MedicalQueryType.PREVENTIVE_CARE: """
 You are a medical AI assistant. Provide preventive care information for:
 1. Recommended screenings and check-ups
 2. Lifestyle modifications for prevention
@@ -184,7 +234,7 @@ Context: {context}
 
 Focus on evidence-based preventive measures and the importance of regular healthcare visits.
 """,
-            MedicalQueryType.EMERGENCY_ASSESSMENT: """
+    MedicalQueryType.EMERGENCY_ASSESSMENT: """
 You are a medical AI assistant. Assess the urgency of the following situation:
 1. Immediate safety concerns
 2. Urgency level assessment
@@ -198,7 +248,7 @@ Context: {context}
 
 Prioritize safety and provide clear guidance on when emergency care is needed.
 """,
-            MedicalQueryType.GENERAL_QUESTION: """
+    MedicalQueryType.GENERAL_QUESTION: """
 You are a medical AI assistant. Answer the following medical question:
 1. Provide accurate, evidence-based information
 2. Address the specific question asked
@@ -211,8 +261,170 @@ Question: {query}
 Context: {context}
 
 Provide helpful, accurate information while emphasizing the importance of professional medical advice for specific situations.
-"""
+""",
+})
+
+
+def _keyword_pattern(keywords: Iterable[str]) -> "re.Pattern[str]":
+    """One alternation regex so a keyword list is matched in a single scan"""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+def _split_template(template: str) -> Tuple[str, str, str]:
+    """Pre-split a '{query} ... {context}' template into its literal parts"""
+    head, rest = template.split("{query}")
+    middle, tail = rest.split("{context}")
+    return head, middle, tail
+
+
+def _cache_key(*parts: Any) -> str:
+    """Short digest over the normalized inputs that shape an LLM result"""
+    material = "|".join(
+        json.dumps(part, sort_keys=True, default=str)
+        if isinstance(part, dict) else str(part)
+        for part in parts
+    )
+    return hashlib.blake2b(material.encode(), digest_size=16).hexdigest()
+
+
+@dataclass(slots=True)
+class MedicalAnalysisRequest:
+    """Medical analysis request."""
+    query: str
+    query_type: MedicalQueryType
+    language: str = "en"
+    context: Optional[Dict[str, Any]] = None
+    user_age: Optional[int] = None
+    user_gender: Optional[str] = None
+    existing_conditions: Optional[List[str]] = None
+    medications: Optional[List[str]] = None
+    symptoms_duration: Optional[str] = None
+    severity_level: Optional[str] = None
+
+
+@dataclass(slots=True)
+class MedicalAnalysisResponse:
+    """Medical analysis response."""
+    analysis: str
+    recommendations: List[str]
+    safety_level: SafetyLevel
+    confidence_score: float
+    query_type: MedicalQueryType
+    disclaimers: List[str] = field(default_factory=list)
+    follow_up_questions: List[str] = field(default_factory=list)
+    emergency_indicators: List[str] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+    structured_data: Dict[str, Any] = field(default_factory=dict)
+
+
+class MedicalAnalyzer:
+    """
+    Medical analysis service using LLMs with safety checks and structured output.
+    
+    Provides medical reasoning, symptom analysis, and safety assessments.
+    """
+    
+    def __init__(self, llm_client: LLMClient):
+        """
+        Initialize medical analyzer.
+        
+        Args:
+            llm_client: LLM client for medical reasoning
+        """
+        self.llm_client = llm_client
+        self.safety_keywords = _SAFETY_KEYWORDS
+        self.emergency_keywords = _EMERGENCY_KEYWORDS
+        self.medical_prompts = _MEDICAL_PROMPTS
+        self._prompt_parts = {
+            query_type: _split_template(template)
+            for query_type, template in self.medical_prompts.items()
         }
+        # Persona is applied universally; built once instead of per call
+        self._system_prompt = settings.SYSTEM_PROMPT + "\n" + _ANALYSIS_INSTRUCTIONS
+        self._safety_matchers = self._build_safety_matchers()
+        # Parsed analyses and LLM safety levels for repeated queries
+        self._analysis_cache = TTLLRUCache(
+            maxsize=settings.CACHE_MAX_SIZE, ttl=settings.CACHE_TTL
+        )
+        self._safety_cache = TTLLRUCache(
+            maxsize=settings.CACHE_MAX_SIZE, ttl=settings.CACHE_TTL
+        )
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        
+    def _build_safety_matchers(
+        self,
+    ) -> List[Tuple["re.Pattern[str]", str, SafetyLevel]]:
+        """
+        Compile the keyword tables into (pattern, metric source, level)
+        tiers, checked in order: the emergency category first, then the
+        standalone emergency keywords, then the urgent and caution
+        categories.
+        """
+        category_levels = {
+            "emergency": SafetyLevel.EMERGENCY,
+            "urgent": SafetyLevel.URGENT,
+            "caution": SafetyLevel.CAUTION,
+        }
+        matchers = [
+            (
+                _keyword_pattern(keywords),
+                f"{category}_category",
+                category_levels[category],
+            )
+            for category, keywords in self.safety_keywords.items()
+        ]
+        # Curated phrases win over the generic keywords at the same level,
+        # so a query with both still gets the canned emergency response
+        matchers.insert(
+            1,
+            (
+                _keyword_pattern(self.emergency_keywords),
+                "emergency_keyword",
+                SafetyLevel.EMERGENCY,
+            ),
+        )
+        return matchers
+    
+    async def _cached_call(
+        self,
+        cache: TTLLRUCache,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Return ``cache[key]``, computing it at most once at a time: concurrent
+        callers with the same key await the in-flight computation.
+        Failures are not cached; if the computing caller is cancelled, the
+        waiters recompute instead of inheriting its cancellation.
+        """
+        while True:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            result = await asyncio.shield(pending)
+            if result is not _RECOMPUTE:
+                return result
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.set_result(_RECOMPUTE)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Consume it so an unawaited future doesn't log a warning
+            future.exception()
+            raise
+        else:
+            cache.set(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
     
     async def analyze(
         self, 
@@ -231,61 +443,148 @@ Provide helpful, accurate information while emphasizing the importance of profes
             MedicalAnalysisError: If analysis fails
             SafetyCheckError: If safety check fails
         """
+        started = time.perf_counter()
         try:
-            # Perform safety check first
-            safety_level = await self._perform_safety_check(request)
+            # Curated emergency phrases get the canned response straight away
+            keyword_hit = self._match_safety_keywords(request.query.lower())
+            if keyword_hit is not None and keyword_hit[1] == _CANNED_EMERGENCY_SOURCE:
+                level, source, keyword = keyword_hit
+                await self._record_safety(source, level, started)
+                await record_medical_analysis(
+                    request_id=f"analysis-{request.query_type.value}",
+                    analysis_type=request.query_type.value,
+                    duration=time.perf_counter() - started,
+                    success=True,
+                )
+                logger.info("Emergency keyword '{}' matched; skipping LLM analysis", keyword)
+                return self._build_emergency_response(request, keyword)
             
-            # Generate medical analysis
-            analysis_result = await self._generate_medical_analysis(request)
+            # Safety check and analysis are independent LLM calls; overlap them
+            analysis_key = "analysis:" + _cache_key(
+                request.query_type.value,
+                request.query.strip().lower(),
+                request.language,
+                request.context,
+            )
+            safety_level, analysis_result = await asyncio.gather(
+                self._perform_safety_check(request, keyword_hit),
+                self._cached_call(
+                    self._analysis_cache,
+                    analysis_key,
+                    lambda: self._generate_medical_analysis(request),
+                ),
+            )
             
             # Structure the response
             response = self._structure_response(analysis_result, safety_level, request)
             
             # Record metrics
-            await record_medical_analysis(request.query_type, safety_level)
+            await record_medical_analysis(
+                request_id=f"analysis-{request.query_type.value}",
+                analysis_type=request.query_type.value,
+                duration=time.perf_counter() - started,
+                success=True,
+            )
             
-            logger.info(f"Medical analysis completed for {request.query_type} with safety level {safety_level}")
+            logger.info(
+                "Medical analysis completed for {} with safety level {}",
+                request.query_type,
+                safety_level,
+            )
             return response
             
         except Exception as e:
-            logger.error(f"Medical analysis failed: {e}")
+            logger.error("Medical analysis failed: {}", e)
             raise MedicalAnalysisError(f"Medical analysis failed: {e}")
     
-    async def _perform_safety_check(self, request: MedicalAnalysisRequest) -> SafetyLevel:
+    async def _perform_safety_check(
+        self,
+        request: MedicalAnalysisRequest,
+        keyword_hit: Optional[Tuple[SafetyLevel, str, str]],
+    ) -> SafetyLevel:
         """
         Perform safety assessment of the medical query.
         
         Args:
             request: Medical analysis request
+            keyword_hit: The caller's ``_match_safety_keywords`` result
             
         Returns:
             SafetyLevel indicating urgency
         """
+        started = time.perf_counter()
         try:
             query_lower = request.query.lower()
             
-            # Check for emergency keywords
-            for keyword in self.emergency_keywords:
-                if keyword in query_lower:
-                    await record_safety_check("emergency_keyword", SafetyLevel.EMERGENCY)
-                    return SafetyLevel.EMERGENCY
+            if keyword_hit is not None:
+                level, source, _ = keyword_hit
+                await self._record_safety(source, level, started)
+                return level
             
-            # Check safety keyword categories
-            for category, keywords in self.safety_keywords.items():
-                for keyword in keywords:
-                    if keyword in query_lower:
-                        if category == "emergency":
-                            await record_safety_check("emergency_category", SafetyLevel.EMERGENCY)
-                            return SafetyLevel.EMERGENCY
-                        elif category == "urgent":
-                            await record_safety_check("urgent_category", SafetyLevel.URGENT)
-                            return SafetyLevel.URGENT
-                        elif category == "caution":
-                            await record_safety_check("caution_category", SafetyLevel.CAUTION)
-                            return SafetyLevel.CAUTION
+            # Greetings and thanks carry nothing to triage: no LLM hop
+            if _NON_CLINICAL_RE.fullmatch(query_lower.strip()):
+                await self._record_safety(
+                    "non_clinical_allowlist", SafetyLevel.SAFE, started
+                )
+                return SafetyLevel.SAFE
             
             # Use LLM for more nuanced safety assessment
-            safety_prompt = f"""
+            safety_level = await self._cached_call(
+                self._safety_cache,
+                "safety:" + _cache_key(query_lower.strip(), request.context),
+                lambda: self._llm_safety_assessment(request),
+            )
+            await self._record_safety("llm_assessment", safety_level, started)
+            
+            return safety_level
+            
+        except Exception as e:
+            logger.error("Safety check failed: {}", e)
+            # Default to caution if safety check fails
+            return SafetyLevel.CAUTION
+    
+    async def _record_safety(
+        self, check_type: str, level: SafetyLevel, started: float
+    ) -> None:
+        """Report a safety check; urgent and emergency levels count as failed"""
+        await record_safety_check(
+            request_id=f"safety-{check_type}",
+            check_type=check_type,
+            passed=level not in _HIGH_SEVERITY,
+            duration=time.perf_counter() - started,
+            details={"safety_level": level.value},
+        )
+    
+    def _match_safety_keywords(
+        self, query_lower: str
+    ) -> Optional[Tuple[SafetyLevel, str, str]]:
+        """First keyword tier hit, most severe first, as (level, source, text)"""
+        for pattern, source, level in self._safety_matchers:
+            match = pattern.search(query_lower)
+            if match:
+                return level, source, match.group(0)
+        return None
+    
+    def _build_emergency_response(
+        self, request: MedicalAnalysisRequest, keyword: str
+    ) -> MedicalAnalysisResponse:
+        """Immediate-care response for keyword emergencies, without the LLM"""
+        return self._structure_response(
+            {
+                "analysis": _EMERGENCY_ANALYSIS,
+                "recommendations": list(_EMERGENCY_RECOMMENDATIONS),
+                "emergency_indicators": [keyword],
+                "confidence_score": 0.9,
+            },
+            SafetyLevel.EMERGENCY,
+            request,
+        )
+    
+    async def _llm_safety_assessment(
+        self, request: MedicalAnalysisRequest
+    ) -> SafetyLevel:
+        """Ask the LLM for a one-word safety level (errors propagate)"""
+        safety_prompt = f"""
 Assess the safety level of this medical query. Consider:
 - Urgency of symptoms
 - Potential for serious conditions
@@ -298,32 +597,19 @@ Context: {request.context or 'No additional context'}
 Respond with only one word: SAFE, CAUTION, URGENT, or EMERGENCY
 """
             
-            safety_request = LLMRequest(
-                prompt=safety_prompt,
-                max_tokens=10,
-                temperature=0.1
-            )
-            
-            safety_response = await self.llm_client.generate(safety_request)
-            safety_result = safety_response.content.strip().upper()
-            
-            # Map LLM response to safety level
-            safety_mapping = {
-                "SAFE": SafetyLevel.SAFE,
-                "CAUTION": SafetyLevel.CAUTION,
-                "URGENT": SafetyLevel.URGENT,
-                "EMERGENCY": SafetyLevel.EMERGENCY
-            }
-            
-            safety_level = safety_mapping.get(safety_result, SafetyLevel.CAUTION)
-            await record_safety_check("llm_assessment", safety_level)
-            
-            return safety_level
-            
-        except Exception as e:
-            logger.error(f"Safety check failed: {e}")
-            # Default to caution if safety check fails
-            return SafetyLevel.CAUTION
+        safety_request = LLMRequest(
+            prompt=safety_prompt,
+            max_tokens=10,
+            temperature=0.1,
+            model=settings.SAFETY_MODEL
+        )
+        
+        safety_response = await self.llm_client.generate(safety_request)
+        
+        # Map LLM response to safety level
+        return _SAFETY_STR_TO_LEVEL.get(
+            safety_response.content.strip().upper(), SafetyLevel.CAUTION
+        )
     
     async def _generate_medical_analysis(
         self, 
@@ -339,43 +625,19 @@ Respond with only one word: SAFE, CAUTION, URGENT, or EMERGENCY
             Dictionary with analysis results
         """
         # Get appropriate prompt template
-        prompt_template = self.medical_prompts.get(
+        head, middle, tail = self._prompt_parts.get(
             request.query_type, 
-            self.medical_prompts[MedicalQueryType.GENERAL_QUESTION]
+            self._prompt_parts[MedicalQueryType.GENERAL_QUESTION]
         )
         
         # Format prompt with context
         context_str = json.dumps(request.context) if request.context else "No additional context"
         
-        formatted_prompt = prompt_template.format(
-            query=request.query,
-            context=context_str
-        )
-        
-        # Add safety and disclaimer instructions
-        system_prompt = (
-            settings.SYSTEM_PROMPT
-            + "\n"  # Ensure persona is applied universally
-            + (
-                "You are a medical AI assistant. Provide helpful, "
-                "evidence-based medical information while:\n\n"
-                "1. Always emphasize consulting healthcare providers for "
-                "specific medical advice\n"
-                "2. Include appropriate disclaimers about the limitations of "
-                "AI medical advice\n"
-                "3. Prioritize safety and recommend medical attention when "
-                "appropriate\n"
-                "4. Provide structured, clear responses\n"
-                "5. Acknowledge when symptoms require immediate medical "
-                "attention\n\n"
-                "Your responses should be educational and supportive, not "
-                "diagnostic or prescriptive."
-            )
-        )
+        formatted_prompt = head + request.query + middle + context_str + tail
         
         llm_request = LLMRequest(
             prompt=formatted_prompt,
-            system_prompt=system_prompt,
+            system_prompt=self._system_prompt,
             max_tokens=2048,
             temperature=0.1
         )
@@ -403,14 +665,14 @@ Respond with only one word: SAFE, CAUTION, URGENT, or EMERGENCY
         # Extract recommendations
         recommendations = self._extract_recommendations(content)
         
-        # Extract disclaimers
-        disclaimers = self._extract_disclaimers(content)
+        # Split once; the sentence extractors share the result
+        sentences = [s.strip() for s in _SENT_SPLIT.split(content)]
         
-        # Extract follow-up questions
-        follow_up_questions = self._extract_follow_up_questions(content)
+        # Extract disclaimers and emergency indicators in one pass
+        disclaimers, emergency_indicators = self._classify_sentences(sentences)
         
-        # Extract emergency indicators
-        emergency_indicators = self._extract_emergency_indicators(content)
+        # Extract follow-up questions
+        follow_up_questions = self._extract_follow_up_questions(sentences)
         
         # Calculate confidence score (simplified)
         confidence_score = self._calculate_confidence_score(content, query_type)
@@ -429,62 +691,49 @@ Respond with only one word: SAFE, CAUTION, URGENT, or EMERGENCY
         recommendations = []
         
         # Look for numbered or bulleted recommendations
-        lines = content.split('\n')
-        for line in lines:
-            line = line.strip()
-            if (line.startswith(('•', '-', '*', '1.', '2.', '3.')) and 
-                any(keyword in line.lower() for keyword in ['recommend', 'should', 'consider', 'seek', 'consult'])):
-                recommendations.append(line.lstrip('•-*123456789. '))
-        
-        return recommendations[:5]  # Limit to top 5
+        for match in _REC_RE.finditer(content):
+            recommendations.append(
+                match.group(1).rstrip().lstrip(_REC_STRIP_CHARS)
+            )
+            if len(recommendations) == 5:  # Limit to top 5
+                break
+        
+        return recommendations
     
-    def _extract_disclaimers(self, content: str) -> List[str]:
-        """Extract disclaimers from LLM response."""
+    def _classify_sentences(
+        self, sentences: List[str]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Bucket the stripped response sentences into disclaimers (top 3) and
+        emergency indicators with a single regex scan per sentence.
+        """
         disclaimers = []
+        indicators = []
         
-        disclaimer_keywords = [
-            'disclaimer', 'important', 'note', 'warning', 'caution',
-            'consult', 'professional', 'medical advice', 'limitation'
-        ]
-        
-        sentences = re.split(r'[.!?]', content)
         for sentence in sentences:
-            sentence = sentence.strip()
-            if any(keyword in sentence.lower() for keyword in disclaimer_keywords):
+            found = set()
+            for match in _CLASSIFY_RE.finditer(sentence.lower()):
+                found.add(match.lastgroup)
+                if len(found) == 2:
+                    break
+            if "disclaimer" in found and len(disclaimers) < 3:
                 disclaimers.append(sentence)
+            if "emergency" in found:
+                indicators.append(sentence)
         
-        return disclaimers[:3]  # Limit to top 3
+        return disclaimers, indicators
     
-    def _extract_follow_up_questions(self, content: str) -> List[str]:
-        """Extract follow-up questions from LLM response."""
+    def _extract_follow_up_questions(self, sentences: List[str]) -> List[str]:
+        """Extract follow-up questions from the stripped response sentences."""
         questions = []
         
         # Look for question marks
-        sentences = re.split(r'[.!?]', content)
         for sentence in sentences:
-            sentence = sentence.strip()
-            if '?' in sentence and len(sentence) > 10:
+            if '?' in sentence and len(sentence) > _FOLLOWUP_MIN_LEN:
                 questions.append(sentence)
         
         return questions[:3]  # Limit to top 3
     
-    def _extract_emergency_indicators(self, content: str) -> List[str]:
-        """Extract emergency indicators from LLM response."""
-        indicators = []
-        
-        emergency_phrases = [
-            'seek immediate', 'emergency', 'urgent', 'call 911',
-            'go to hospital', 'emergency room', 'immediate attention'
-        ]
-        
-        sentences = re.split(r'[.!?]', content)
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if any(phrase in sentence.lower() for phrase in emergency_phrases):
-                indicators.append(sentence)
-        
-        return indicators
-    
     def _calculate_confidence_score(self, content: str, query_type: MedicalQueryType) -> float:
         """
         Calculate confidence score for the analysis.
@@ -510,20 +759,22 @@ Respond with only one word: SAFE, CAUTION, URGENT, or EMERGENCY
         # Adjust based on response quality indicators
         quality_indicators = 0.0
         
+        content_lower = content.lower()
+        
         # Check for structured response
-        if any(marker in content for marker in ['1.', '2.', '3.', '•', '-']):
+        if any(marker in content for marker in _STRUCTURE_MARKERS):
             quality_indicators += 0.1
         
         # Check for disclaimers (indicates responsible response)
-        if any(word in content.lower() for word in ['consult', 'professional', 'medical advice']):
+        if any(word in content_lower for word in _CONSULT_WORDS):
             quality_indicators += 0.1
         
         # Check for specific recommendations
-        if any(word in content.lower() for word in ['recommend', 'should', 'consider']):
+        if any(word in content_lower for word in _RECOMMEND_WORDS):
             quality_indicators += 0.1
         
         # Check for safety considerations
-        if any(word in content.lower() for word in ['safety', 'emergency', 'urgent']):
+        if any(word in content_lower for word in _SAFETY_WORDS):
             quality_indicators += 0.1
         
         return min(1.0, base_confidence + quality_indicators)
@@ -545,9 +796,9 @@ Respond with only one word: SAFE, CAUTION, URGENT, or EMERGENCY
         Returns:
             Structured MedicalAnalysisResponse
         """
-        # Add safety-based disclaimers
-        disclaimers = analysis_result.get("disclaimers", [])
-        if safety_level in [SafetyLevel.URGENT, SafetyLevel.EMERGENCY]:
+        # Add safety-based disclaimers (copied: analysis_result may be cached)
+        disclaimers = list(analysis_result.get("disclaimers", []))
+        if safety_level in _HIGH_SEVERITY:
             disclaimers.insert(0, "This situation may require immediate medical attention. Please consult a healthcare provider or emergency services.")
         
         # Add general medical disclaimer
@@ -555,13 +806,13 @@ Respond with only one word: SAFE, CAUTION, URGENT, or EMERGENCY
         
         return MedicalAnalysisResponse(
             analysis=analysis_result["analysis"],
-            recommendations=analysis_result.get("recommendations", []),
+            recommendations=list(analysis_result.get("recommendations", [])),
             safety_level=safety_level,
             confidence_score=analysis_result.get("confidence_score", 0.5),
             query_type=request.query_type,
             disclaimers=disclaimers,
-            follow_up_questions=analysis_result.get("follow_up_questions", []),
-            emergency_indicators=analysis_result.get("emergency_indicators", []),
+            follow_up_questions=list(analysis_result.get("follow_up_questions", [])),
+            emergency_indicators=list(analysis_result.get("emergency_indicators", [])),
             sources=[],  # TODO: Add source tracking
             structured_data={
                 "query_type": request.query_type.value,
@@ -571,10 +822,14 @@ Respond with only one word: SAFE, CAUTION, URGENT, or EMERGENCY
             }
         )
     
-    async def health_check(self) -> Dict[str, Any]:
+    async def health_check(self, deep: bool = False) -> Dict[str, Any]:
         """
         Check health of medical analyzer.
         
+        Args:
+            deep: Also run a full analyze() smoke test (LLM calls; meant for
+                startup probes, not frequent liveness checks)
+        
         Returns:
             Health status
         """
@@ -582,6 +837,16 @@ Respond with only one word: SAFE, CAUTION, URGENT, or EMERGENCY
             # Test LLM client health
             llm_health = await self.llm_client.health_check()
             
+            if not (self.emergency_keywords and self.safety_keywords.get("emergency")):
+                raise MedicalAnalysisError("Safety keyword tables are empty")
+            
+            health = {
+                "status": "healthy",
+                "llm_client": llm_health,
+            }
+            if not deep:
+                return health
+            
             # Test basic analysis
             test_request = MedicalAnalysisRequest(
                 query="What are common symptoms of a cold?",
@@ -590,18 +855,15 @@ Respond with only one word: SAFE, CAUTION, URGENT, or EMERGENCY
             
             test_response = await self.analyze(test_request)
             
-            return {
-                "status": "healthy",
-                "llm_client": llm_health,
-                "analysis_test": {
-                    "success": True,
-                    "safety_level": test_response.safety_level.value,
-                    "confidence_score": test_response.confidence_score
-                }
+            health["analysis_test"] = {
+                "success": True,
+                "safety_level": test_response.safety_level.value,
+                "confidence_score": test_response.confidence_score
             }
+            return health
             
         except Exception as e:
-            logger.error(f"Medical analyzer health check failed: {e}")
+            logger.error("Medical analyzer health check failed: {}", e)
             return {
                 "status": "unhealthy",
                 "error": str(e)
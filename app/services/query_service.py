@@ -2,10 +2,12 @@
 Query history service for managing query records in the database
 """
 
+import asyncio
+import functools
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import and_, desc, insert, or_, text
 
 from app.models.database_models import Query
 from app.utils.logger import get_logger
@@ -13,11 +15,62 @@ from app.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _in_thread(func):
+    """
+    Run a blocking ORM method in a worker thread.
+    
+    The session is synchronous, so awaiting the wrapped method hands the
+    database round trip to the default executor instead of stalling the
+    event loop. Each call still uses its session from one thread at a time.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return wrapper
+
+
 class QueryService:
     """Service for managing query history"""
     
     @staticmethod
-    async def create_query_record(
+    def _record_values(
+        user_id: Optional[int],
+        query_text: str,
+        response_text: str,
+        processing_time: float,
+        success: bool,
+        sources: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        original_language: str = "en",
+        target_language: str = "en",
+    ) -> Dict[str, Any]:
+        """Column values for one query record (see create_query_record)"""
+        # Convert sources to comma-separated string; dicts contribute
+        # their URL or title
+        sources_str = ",".join(
+            (source.get('url') or source.get('title') or str(source))
+            if isinstance(source, dict) else str(source)
+            for source in sources
+        ) if sources else None
+        
+        return {
+            "user_id": user_id,
+            "query_text": query_text,
+            "response_text": response_text,
+            "processing_time": processing_time,
+            "success": success,
+            "sources": sources_str,
+            "request_metadata": metadata or {},
+            "error": error,
+            "original_language": original_language,
+            "target_language": target_language,
+            "timestamp": datetime.now(timezone.utc),
+        }
+    
+    @staticmethod
+    @_in_thread
+    def create_query_record(
         db: Session,
         user_id: Optional[int],
         query_text: str,
@@ -50,37 +103,24 @@ class QueryService:
             Created Query object
         """
         try:
-            # Convert sources to comma-separated string, handling dict objects
-            if sources:
-                sources_list = []
-                for source in sources:
-                    if isinstance(source, dict):
-                        # Extract URL or title from dict
-                        sources_list.append(source.get('url') or source.get('title') or str(source))
-                    else:
-                        sources_list.append(str(source))
-                sources_str = ",".join(sources_list)
-            else:
-                sources_str = None
-            
             # Create query record
-            query_record = Query(
+            query_record = Query(**QueryService._record_values(
                 user_id=user_id,
                 query_text=query_text,
                 response_text=response_text,
                 processing_time=processing_time,
                 success=success,
-                sources=sources_str,
-                metadata=metadata or {},
+                sources=sources,
+                metadata=metadata,
                 error=error,
                 original_language=original_language,
                 target_language=target_language,
-                timestamp=datetime.now(timezone.utc),
-            )
+            ))
             
+            # id is generated client-side and created_at comes back with the
+            # INSERT (eager_defaults), so no refresh SELECT is needed
             db.add(query_record)
             db.commit()
-            db.refresh(query_record)
             
             logger.info(f"Created query record ID: {query_record.id} for user: {user_id or 'anonymous'}")
             return query_record
@@ -91,7 +131,41 @@ class QueryService:
             raise
     
     @staticmethod
-    async def get_user_query_history(
+    @_in_thread
+    def create_query_records_bulk(
+        db: Session,
+        records: List[Dict[str, Any]],
+    ) -> int:
+        """
+        Insert many query records in one executemany round trip
+        
+        Meant for logging/replay ingest: no ORM objects are built and
+        nothing is refreshed afterwards.
+        
+        Args:
+            db: Database session
+            records: One dict per record, keyed like the create_query_record
+                arguments (without ``db``)
+            
+        Returns:
+            Number of records inserted
+        """
+        if not records:
+            return 0
+        try:
+            rows = [QueryService._record_values(**record) for record in records]
+            db.execute(insert(Query), rows)
+            db.commit()
+            logger.info(f"Bulk-inserted {len(rows)} query records")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error bulk-inserting query records: {e}")
+            db.rollback()
+            raise
+    
+    @staticmethod
+    @_in_thread
+    def get_user_query_history(
         db: Session,
         user_id: int,
         limit: int = 50,
@@ -124,7 +198,55 @@ class QueryService:
             raise
     
     @staticmethod
-    async def get_query_by_id(
+    @_in_thread
+    def get_user_query_history_before(
+        db: Session,
+        user_id: int,
+        before: Optional[datetime] = None,
+        before_id: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Query]:
+        """
+        Keyset-paginated query history for a specific user
+        
+        Unlike offset paging, each page is an index range scan on
+        (user_id, timestamp, id), so deep pages cost the same as the first.
+        The cursor is the (timestamp, id) of the previous page's last row;
+        id breaks ties so rows sharing a timestamp are never skipped.
+        
+        Args:
+            db: Database session
+            user_id: ID of the user
+            before: Timestamp of the previous page's last query; None for
+                the newest page
+            before_id: ID of the previous page's last query
+            limit: Maximum number of records to return
+            
+        Returns:
+            List of Query objects, newest first
+        """
+        try:
+            query = db.query(Query).filter(Query.user_id == user_id)
+            if before is not None:
+                if before_id is None:
+                    query = query.filter(Query.timestamp < before)
+                else:
+                    query = query.filter(or_(
+                        Query.timestamp < before,
+                        and_(Query.timestamp == before, Query.id < before_id),
+                    ))
+            return (
+                query.order_by(desc(Query.timestamp), desc(Query.id))
+                .limit(limit)
+                .all()
+            )
+        except Exception as e:
+            logger.error(f"Error fetching query history for user {user_id}: {e}")
+            raise
+    
+    @staticmethod
+    @_in_thread
+    def get_query_by_id(
         db: Session,
         query_id: int,
         user_id: Optional[int] = None,
@@ -153,7 +275,8 @@ class QueryService:
             raise
     
     @staticmethod
-    async def delete_query(
+    @_in_thread
+    def delete_query(
         db: Session,
         query_id: int,
         user_id: int,
@@ -190,12 +313,16 @@ class QueryService:
             raise
     
     @staticmethod
-    async def get_query_count(
+    @_in_thread
+    def get_query_count_exact(
         db: Session,
         user_id: Optional[int] = None,
     ) -> int:
         """
-        Get total query count, optionally filtered by user
+        Get exact query count, optionally filtered by user
+        
+        Per-user counts are served by idx_queries_user_id; the global count
+        scans the whole table, see get_query_count_estimate.
         
         Args:
             db: Database session
@@ -214,3 +341,39 @@ class QueryService:
         except Exception as e:
             logger.error(f"Error counting queries: {e}")
             raise
+    
+    # Kept for existing callers
+    get_query_count = get_query_count_exact
+    
+    @staticmethod
+    @_in_thread
+    def get_query_count_estimate(db: Session) -> int:
+        """
+        Get an approximate total query count
+        
+        On PostgreSQL this reads the planner's row estimate from pg_class,
+        which is kept current by autovacuum/ANALYZE and costs nothing to
+        fetch. Other backends, or a table that has never been analyzed,
+        fall back to the exact count.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Estimated count of queries
+        """
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                estimate = db.execute(
+                    text(
+                        "SELECT reltuples::bigint FROM pg_class "
+                        "WHERE oid = to_regclass(:table)"
+                    ),
+                    {"table": Query.__tablename__},
+                ).scalar()
+                # reltuples is -1 (PG14+) or 0 until the first ANALYZE
+                if estimate is not None and estimate > 0:
+                    return int(estimate)
+        except Exception as e:
+            logger.warning(f"Query count estimate unavailable: {e}")
+        return db.query(Query).count()
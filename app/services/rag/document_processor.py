@@ -6,20 +6,70 @@ including text extraction, chunking, and metadata extraction.
 """
 
 import asyncio
+import os
 import re
 import time
+from collections import Counter
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, field
 from enum import Enum
-from pathlib import Path
-import hashlib
 
+import orjson
 from loguru import logger
 
 from app.config import settings
 from app.core.exceptions import DocumentProcessingError
 from app.services.rag.vector_store import Document
-from app.utils.metrics import record_document_processing
+from app.utils.metrics import (
+    record_document_processing,
+    record_document_processing_batch,
+)
+
+
+# Text cleaning passes, compiled once
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\.\,\!\?\;\:\-\(\)\[\]\{\}]')
+
+# Sentence terminators for the sentence chunker. str.translate is much
+# faster than the regex on ASCII text but slower on anything else, so the
+# table is only used for ASCII input.
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+_SENTENCE_END_TABLE = str.maketrans('.!?', '\x00\x00\x00')
+
+# Word tokens for language detection and topic extraction
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Common function words used by the language heuristic
+_YORUBA_WORDS = frozenset({'ni', 'ti', 'o', 'a', 'e', 'ki', 'bi', 'si', 'fun', 'lori'})
+_ENGLISH_WORDS = frozenset({'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of'})
+
+# Stop words excluded from topic extraction
+_TOPIC_STOP_WORDS = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had',
+    'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might'
+})
+
+
+# Documents at least this long are cleaned, analyzed and chunked in a worker
+# thread; below it the thread hop costs more than the work it moves
+_OFFLOAD_MIN_CHARS = 100_000
+
+
+def _split_sentences(text: str) -> List[str]:
+    """Split text on sentence terminators, dropping empty sentences"""
+    if text.isascii() and '\x00' not in text:
+        parts = text.translate(_SENTENCE_END_TABLE).split('\x00')
+    else:
+        parts = _SENTENCE_END_RE.split(text)
+    return [part.strip() for part in parts if part.strip()]
+
+
+async def _run_text_task(func, text: str, *args):
+    """Run a CPU-bound text step inline, or off the event loop for large text"""
+    if len(text) < _OFFLOAD_MIN_CHARS:
+        return func(text, *args)
+    return await asyncio.to_thread(func, text, *args)
 
 
 class DocumentType(str, Enum):
@@ -41,7 +91,7 @@ class ChunkingStrategy(str, Enum):
     PARAGRAPH = "paragraph"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProcessingOptions:
     """Document processing options."""
     chunk_size: int = 1000
@@ -51,9 +101,19 @@ class ProcessingOptions:
     extract_metadata: bool = True
     clean_text: bool = True
     language: str = "en"
+    
+    def __post_init__(self):
+        # An overlap as large as the chunk would never move the window forward
+        if self.chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= self.chunk_overlap < self.chunk_size:
+            raise ValueError(
+                f"chunk_overlap must be in [0, chunk_size), got "
+                f"{self.chunk_overlap} with chunk_size {self.chunk_size}"
+            )
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessedDocument:
     """Processed document with chunks."""
     original_document: Document
@@ -85,7 +145,8 @@ class DocumentProcessor:
     async def process_document(
         self, 
         document: Document, 
-        options: ProcessingOptions
+        options: ProcessingOptions,
+        record_metrics: bool = True,
     ) -> ProcessedDocument:
         """
         Process a document for RAG.
@@ -93,6 +154,8 @@ class DocumentProcessor:
         Args:
             document: Document to process
             options: Processing options
+            record_metrics: Record per-document metrics (process_documents
+                records one batch entry instead)
             
         Returns:
             ProcessedDocument with chunks
@@ -111,7 +174,7 @@ class DocumentProcessor:
             
             # Clean text if requested
             if options.clean_text:
-                text_content = self._clean_text(text_content)
+                text_content = await _run_text_task(self._clean_text, text_content)
             
             # Extract metadata if requested
             metadata = {}
@@ -129,11 +192,15 @@ class DocumentProcessor:
             processing_time = time.time() - start_time
             
             # Record metrics
-            await record_document_processing(
-                doc_type.value, 
-                len(chunks), 
-                processing_time
-            )
+            if record_metrics:
+                await record_document_processing(
+                    request_id=document.id,
+                    document_type=doc_type.value,
+                    file_size=len(text_content),
+                    chunks_created=len(chunks),
+                    duration=processing_time,
+                    success=True,
+                )
             
             logger.info(f"Processed document {document.id} into {len(chunks)} chunks in {processing_time:.2f}s")
             
@@ -148,6 +215,51 @@ class DocumentProcessor:
             logger.error(f"Document processing failed: {e}")
             raise DocumentProcessingError(f"Document processing failed: {e}")
     
+    async def process_documents(
+        self,
+        documents: List[Document],
+        options: ProcessingOptions,
+        max_concurrency: int = 4,
+    ) -> List[ProcessedDocument]:
+        """
+        Process many documents concurrently for RAG.
+        
+        At most max_concurrency documents are in flight at once, so large
+        batches do not flood the worker threads used for big documents.
+        Metrics are recorded once for the whole batch.
+        
+        Args:
+            documents: Documents to process
+            options: Processing options shared by every document
+            max_concurrency: Maximum documents processed at the same time
+            
+        Returns:
+            ProcessedDocuments in the same order as documents
+            
+        Raises:
+            DocumentProcessingError: If any document fails to process
+        """
+        start_time = time.time()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def process_one(document: Document) -> ProcessedDocument:
+            async with semaphore:
+                return await self.process_document(
+                    document, options, record_metrics=False
+                )
+        
+        processed = await asyncio.gather(
+            *(process_one(document) for document in documents)
+        )
+        
+        await record_document_processing_batch(
+            documents_processed=len(processed),
+            chunks_created=sum(len(result.chunks) for result in processed),
+            duration=time.time() - start_time,
+        )
+        
+        return processed
+    
     def _detect_document_type(self, document: Document) -> DocumentType:
         """Detect document type based on content or metadata."""
         # Check if type is specified in metadata
@@ -157,11 +269,13 @@ class DocumentProcessor:
             except ValueError:
                 pass
         
-        # Check if source path has extension
+        # Check if source path has extension (splitext avoids building a
+        # Path object per document)
         if document.source:
-            path = Path(document.source)
-            if path.suffix.lower() in self.supported_extensions:
-                return self.supported_extensions[path.suffix.lower()]
+            suffix = os.path.splitext(document.source)[1].lower()
+            doc_type = self.supported_extensions.get(suffix)
+            if doc_type is not None:
+                return doc_type
         
         # Default to text
         return DocumentType.TEXT
@@ -223,10 +337,9 @@ class DocumentProcessor:
     async def _extract_json_text(self, document: Document) -> str:
         """Extract text from JSON document."""
         try:
-            import json
-            data = json.loads(document.content)
+            data = orjson.loads(document.content)
             # Convert JSON to readable text format
-            return json.dumps(data, indent=2)
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
         except Exception as e:
             logger.warning(f"JSON parsing failed: {e}")
             return document.content
@@ -240,18 +353,13 @@ class DocumentProcessor:
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Collapse all whitespace, line breaks included, to single spaces.
+        # No line breaks survive this, so no separate line-break or
+        # empty-line pass is needed.
+        text = _WHITESPACE_RE.sub(' ', text)
         
         # Remove special characters that might interfere with processing
-        text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)\[\]\{\}]', '', text)
-        
-        # Normalize line breaks
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
-        
-        # Remove empty lines
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        text = '\n'.join(lines)
+        text = _SPECIAL_CHARS_RE.sub('', text)
         
         return text.strip()
     
@@ -266,6 +374,19 @@ class DocumentProcessor:
         
         # Basic metadata
         metadata['document_type'] = doc_type.value
+        metadata.update(
+            await _run_text_task(self._extract_text_metadata, text_content)
+        )
+        
+        # Merge with existing metadata
+        if document.metadata:
+            metadata.update(document.metadata)
+        
+        return metadata
+    
+    def _extract_text_metadata(self, text_content: str) -> Dict[str, Any]:
+        """Extract metadata derived from the text itself."""
+        metadata = {}
         metadata['content_length'] = len(text_content)
         metadata['word_count'] = len(text_content.split())
         
@@ -284,10 +405,6 @@ class DocumentProcessor:
         if topics:
             metadata['topics'] = topics
         
-        # Merge with existing metadata
-        if document.metadata:
-            metadata.update(document.metadata)
-        
         return metadata
     
     def _extract_title(self, text: str) -> Optional[str]:
@@ -302,16 +419,12 @@ class DocumentProcessor:
     
     def _detect_language(self, text: str) -> Optional[str]:
         """Detect language of text content."""
-        # Simple language detection based on common words
-        text_lower = text.lower()
+        # Simple language detection based on common words. One tokenizing
+        # pass; whole words only, so "a" no longer matches inside "and".
+        word_counts = Counter(_WORD_RE.findall(text.lower()))
         
-        # Yoruba detection
-        yoruba_words = ['ni', 'ti', 'o', 'a', 'e', 'ki', 'bi', 'si', 'fun', 'lori']
-        yoruba_count = sum(1 for word in yoruba_words if word in text_lower)
-        
-        # English detection
-        english_words = ['the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of']
-        english_count = sum(1 for word in english_words if word in text_lower)
+        yoruba_count = sum(word_counts[word] for word in _YORUBA_WORDS)
+        english_count = sum(word_counts[word] for word in _ENGLISH_WORDS)
         
         if yoruba_count > english_count:
             return 'yo'
@@ -322,24 +435,14 @@ class DocumentProcessor:
     
     def _extract_topics(self, text: str) -> List[str]:
         """Extract key topics from text content."""
-        # Simple topic extraction based on frequency
-        words = re.findall(r'\b\w+\b', text.lower())
-        
-        # Remove common stop words
-        stop_words = {
-            'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
-            'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had',
-            'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might'
-        }
-        
-        word_freq = {}
-        for word in words:
-            if word not in stop_words and len(word) > 3:
-                word_freq[word] = word_freq.get(word, 0) + 1
+        # Simple topic extraction based on frequency, skipping stop words
+        word_freq = Counter(
+            word for word in _WORD_RE.findall(text.lower())
+            if len(word) > 3 and word not in _TOPIC_STOP_WORDS
+        )
         
         # Get top 5 most frequent words as topics
-        topics = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:5]
-        return [topic[0] for topic in topics]
+        return [word for word, _ in word_freq.most_common(5)]
     
     async def _chunk_document(
         self, 
@@ -350,16 +453,47 @@ class DocumentProcessor:
     ) -> List[Document]:
         """Chunk document into smaller pieces."""
         if options.chunking_strategy == ChunkingStrategy.FIXED_SIZE:
-            return self._chunk_fixed_size(text, original_doc, options, metadata)
+            return await _run_text_task(
+                self._chunk_fixed_size, text, original_doc, options, metadata
+            )
         elif options.chunking_strategy == ChunkingStrategy.SEMANTIC:
             return await self._chunk_semantic(text, original_doc, options, metadata)
         elif options.chunking_strategy == ChunkingStrategy.SENTENCE:
-            return self._chunk_sentence(text, original_doc, options, metadata)
+            return await _run_text_task(
+                self._chunk_sentence, text, original_doc, options, metadata
+            )
         elif options.chunking_strategy == ChunkingStrategy.PARAGRAPH:
-            return self._chunk_paragraph(text, original_doc, options, metadata)
+            return await _run_text_task(
+                self._chunk_paragraph, text, original_doc, options, metadata
+            )
         else:
             # Default to fixed size
-            return self._chunk_fixed_size(text, original_doc, options, metadata)
+            return await _run_text_task(
+                self._chunk_fixed_size, text, original_doc, options, metadata
+            )
+    
+    def _make_chunk(
+        self,
+        original_doc: Document,
+        chunk_text: str,
+        index: int,
+        base_metadata: Dict[str, Any],
+        strategy: str,
+        **positions: int,
+    ) -> Document:
+        """Build one chunk Document; its metadata dict is built in one step"""
+        return Document(
+            id=f"{original_doc.id}_chunk_{index}",
+            content=chunk_text,
+            metadata={
+                **base_metadata,
+                'chunk_index': index,
+                **positions,
+                'chunk_strategy': strategy,
+                'parent_document_id': original_doc.id,
+            },
+            source=original_doc.source,
+        )
     
     def _chunk_fixed_size(
         self, 
@@ -371,12 +505,17 @@ class DocumentProcessor:
         """Chunk document into fixed-size pieces."""
         chunks = []
         start = 0
-        
-        while start < len(text):
-            end = start + options.chunk_size
+        text_length = len(text)
+        chunk_size = options.chunk_size
+        chunk_overlap = options.chunk_overlap
+        base_metadata = metadata if options.include_metadata else {}
+        strategy = options.chunking_strategy.value
+        
+        while start < text_length:
+            end = start + chunk_size
             
             # Try to break at word boundary
-            if end < len(text):
+            if end < text_length:
                 # Look for the last space before the end
                 last_space = text.rfind(' ', start, end)
                 if last_space > start:
@@ -384,29 +523,16 @@ class DocumentProcessor:
             
             chunk_text = text[start:end].strip()
             if chunk_text:
-                chunk_id = f"{original_doc.id}_chunk_{len(chunks)}"
-                
-                chunk_metadata = metadata.copy() if options.include_metadata else {}
-                chunk_metadata.update({
-                    'chunk_index': len(chunks),
-                    'chunk_start': start,
-                    'chunk_end': end,
-                    'chunk_strategy': options.chunking_strategy.value,
-                    'parent_document_id': original_doc.id
-                })
-                
-                chunk = Document(
-                    id=chunk_id,
-                    content=chunk_text,
-                    metadata=chunk_metadata,
-                    source=original_doc.source
-                )
-                
-                chunks.append(chunk)
+                chunks.append(self._make_chunk(
+                    original_doc, chunk_text, len(chunks), base_metadata,
+                    strategy, chunk_start=start, chunk_end=end,
+                ))
             
-            start = end - options.chunk_overlap
-            if start >= len(text):
-                break
+            # A word break that pulls end back inside the overlap would step
+            # back to (or before) start; continue from end instead of
+            # re-chunking the same text one character further on
+            next_start = end - chunk_overlap
+            start = next_start if next_start > start else end
         
         return chunks
     
@@ -421,7 +547,9 @@ class DocumentProcessor:
         # TODO: Implement semantic chunking
         # This would use NLP techniques to find natural break points
         logger.warning("Semantic chunking not yet implemented, falling back to fixed size")
-        return self._chunk_fixed_size(text, original_doc, options, metadata)
+        return await _run_text_task(
+            self._chunk_fixed_size, text, original_doc, options, metadata
+        )
     
     def _chunk_sentence(
         self, 
@@ -432,36 +560,23 @@ class DocumentProcessor:
     ) -> List[Document]:
         """Chunk document by sentences."""
         # Split into sentences
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        sentences = _split_sentences(text)
         
         chunks = []
         current_chunk = []
         current_length = 0
+        base_metadata = metadata if options.include_metadata else {}
+        strategy = options.chunking_strategy.value
         
         for sentence in sentences:
             sentence_length = len(sentence)
             
             if current_length + sentence_length > options.chunk_size and current_chunk:
                 # Create chunk from current sentences
-                chunk_text = ' '.join(current_chunk)
-                chunk_id = f"{original_doc.id}_chunk_{len(chunks)}"
-                
-                chunk_metadata = metadata.copy() if options.include_metadata else {}
-                chunk_metadata.update({
-                    'chunk_index': len(chunks),
-                    'chunk_strategy': options.chunking_strategy.value,
-                    'parent_document_id': original_doc.id
-                })
-                
-                chunk = Document(
-                    id=chunk_id,
-                    content=chunk_text,
-                    metadata=chunk_metadata,
-                    source=original_doc.source
-                )
-                
-                chunks.append(chunk)
+                chunks.append(self._make_chunk(
+                    original_doc, ' '.join(current_chunk), len(chunks),
+                    base_metadata, strategy,
+                ))
                 
                 # Start new chunk with overlap
                 overlap_sentences = current_chunk[-2:] if len(current_chunk) >= 2 else []
@@ -473,24 +588,10 @@ class DocumentProcessor:
         
         # Add final chunk
         if current_chunk:
-            chunk_text = ' '.join(current_chunk)
-            chunk_id = f"{original_doc.id}_chunk_{len(chunks)}"
-            
-            chunk_metadata = metadata.copy() if options.include_metadata else {}
-            chunk_metadata.update({
-                'chunk_index': len(chunks),
-                'chunk_strategy': options.chunking_strategy.value,
-                'parent_document_id': original_doc.id
-            })
-            
-            chunk = Document(
-                id=chunk_id,
-                content=chunk_text,
-                metadata=chunk_metadata,
-                source=original_doc.source
-            )
-            
-            chunks.append(chunk)
+            chunks.append(self._make_chunk(
+                original_doc, ' '.join(current_chunk), len(chunks),
+                base_metadata, strategy,
+            ))
         
         return chunks
     
@@ -509,30 +610,18 @@ class DocumentProcessor:
         chunks = []
         current_chunk = []
         current_length = 0
+        base_metadata = metadata if options.include_metadata else {}
+        strategy = options.chunking_strategy.value
         
         for paragraph in paragraphs:
             paragraph_length = len(paragraph)
             
             if current_length + paragraph_length > options.chunk_size and current_chunk:
                 # Create chunk from current paragraphs
-                chunk_text = '\n\n'.join(current_chunk)
-                chunk_id = f"{original_doc.id}_chunk_{len(chunks)}"
-                
-                chunk_metadata = metadata.copy() if options.include_metadata else {}
-                chunk_metadata.update({
-                    'chunk_index': len(chunks),
-                    'chunk_strategy': options.chunking_strategy.value,
-                    'parent_document_id': original_doc.id
-                })
-                
-                chunk = Document(
-                    id=chunk_id,
-                    content=chunk_text,
-                    metadata=chunk_metadata,
-                    source=original_doc.source
-                )
-                
-                chunks.append(chunk)
+                chunks.append(self._make_chunk(
+                    original_doc, '\n\n'.join(current_chunk), len(chunks),
+                    base_metadata, strategy,
+                ))
                 
                 # Start new chunk
                 current_chunk = [paragraph]
@@ -543,24 +632,10 @@ class DocumentProcessor:
         
         # Add final chunk
         if current_chunk:
-            chunk_text = '\n\n'.join(current_chunk)
-            chunk_id = f"{original_doc.id}_chunk_{len(chunks)}"
-            
-            chunk_metadata = metadata.copy() if options.include_metadata else {}
-            chunk_metadata.update({
-                'chunk_index': len(chunks),
-                'chunk_strategy': options.chunking_strategy.value,
-                'parent_document_id': original_doc.id
-            })
-            
-            chunk = Document(
-                id=chunk_id,
-                content=chunk_text,
-                metadata=chunk_metadata,
-                source=original_doc.source
-            )
-            
-            chunks.append(chunk)
+            chunks.append(self._make_chunk(
+                original_doc, '\n\n'.join(current_chunk), len(chunks),
+                base_metadata, strategy,
+            ))
         
         return chunks
     
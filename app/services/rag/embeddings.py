@@ -7,19 +7,23 @@ for the RAG (Retrieval-Augmented Generation) system.
 
 import asyncio
 import time
-from typing import Dict, List, Optional, Any, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Union
 from dataclasses import dataclass
 from enum import Enum
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import torch
 from loguru import logger
 
 from app.config import settings
 from app.core.exceptions import EmbeddingError
 from app.utils.metrics import record_embedding_generation, record_embedding_batch
 
+# torch and sentence_transformers take seconds to import; this module is
+# pulled in by the request models, so they are only loaded once an
+# EmbeddingService is actually constructed
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
 
 class EmbeddingModel(str, Enum):
     """Supported embedding models."""
@@ -57,13 +61,15 @@ class EmbeddingService:
     
     def __init__(self):
         """Initialize embedding service."""
-        self.models: Dict[str, SentenceTransformer] = {}
+        self.models: Dict[str, "SentenceTransformer"] = {}
         self.default_model = settings.EMBEDDING_MODEL
         self.device = self._get_device()
         self._load_models()
         
     def _get_device(self) -> str:
         """Get the best available device for embedding generation."""
+        import torch
+        
         if torch.cuda.is_available() and settings.USE_GPU:
             return "cuda"
         elif torch.backends.mps.is_available() and settings.USE_MPS:
@@ -74,6 +80,8 @@ class EmbeddingService:
     def _load_models(self):
         """Load embedding models."""
         try:
+            from sentence_transformers import SentenceTransformer
+            
             # Load default model
             if self.default_model:
                 self.models[self.default_model] = SentenceTransformer(
@@ -161,7 +169,7 @@ class EmbeddingService:
     
     async def _generate_embeddings_async(
         self,
-        model: SentenceTransformer,
+        model: "SentenceTransformer",
         texts: List[str],
         normalize: bool = True,
         batch_size: int = 32
@@ -368,8 +376,11 @@ class EmbeddingService:
                 del self.models[model_name]
             
             # Clear CUDA cache if using GPU
-            if self.device == "cuda" and torch.cuda.is_available():
-                torch.cuda.empty_cache()
+            if self.device == "cuda":
+                import torch
+                
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
             
             logger.info("Embedding service closed")
             
@@ -382,7 +382,9 @@ Respond with ONLY one word: GENERAL or NOT_GENERAL"""
                     
                     # Extract paragraphs
                     paragraphs = content_div.find_all('p')
-                    text_content = ' '.join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
+                    # Each paragraph's text is extracted once, not re-walked for the filter
+                    texts = (p.get_text().strip() for p in paragraphs)
+                    text_content = ' '.join([text for text in texts if text])
                     
                     # Clean up text
                     text_content = re.sub(r'\[.*?\]', '', text_content)  # Remove citation markers
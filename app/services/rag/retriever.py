@@ -239,16 +239,14 @@ class RAGRetriever:
             if not request.processing_options:
                 request.processing_options = ProcessingOptions()
             
-            # Process documents
+            # Process documents into chunks, several at a time
+            processed_documents = await self.document_processor.process_documents(
+                request.documents,
+                request.processing_options,
+            )
             processed_chunks = []
             
-            for document in request.documents:
-                # Process document into chunks
-                processed = await self.document_processor.process_document(
-                    document, 
-                    request.processing_options
-                )
-                
+            for processed in processed_documents:
                 # Generate embeddings for chunks
                 chunk_texts = [chunk.content for chunk in processed.chunks]
                 chunk_embeddings = await self.embedding_service.generate_batch_embeddings(
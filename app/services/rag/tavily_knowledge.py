@@ -10,7 +10,6 @@ import logging
 from typing import Dict, Optional, Any
 
 from langchain_tavily import TavilySearch
-from sentence_transformers import SentenceTransformer
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 
@@ -79,7 +78,10 @@ class TavilyKnowledgeService:
                 }
             )
             
-            # Initialize embedding model for similarity search
+            # Initialize embedding model for similarity search; imported
+            # here so loading the workflow does not pull in torch
+            from sentence_transformers import SentenceTransformer
+            
             self.embedding_model = SentenceTransformer(
                 self.settings.EMBEDDING_MODEL
             )
@@ -6,7 +6,8 @@ import asyncio
 import hashlib
 import json
 import time
-from typing import Any, Dict, Optional, Union
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
 from app.utils.logger import get_logger
@@ -152,6 +153,40 @@ class Cache:
             }
 
 
+class TTLLRUCache:
+    """
+    Bounded, synchronous LRU with a per-entry TTL.
+    
+    Intended for hot paths inside a single event loop where the awaitable,
+    lock-guarded ``Cache`` above would add overhead.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
 # Global cache instance
 _cache: Optional[Cache] = None
 
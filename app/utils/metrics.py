@@ -280,7 +280,7 @@ async def record_translation_metrics(
         logger.error(f"Failed to record translation metrics: {e}")
 
 
-async def record_llm_metrics(
+def observe_llm_metrics(
     request_id: str,
     model: str,
     provider: str,
@@ -288,7 +288,7 @@ async def record_llm_metrics(
     success: bool,
     tokens_used: Optional[int] = None,
 ) -> None:
-    """Record LLM metrics"""
+    """Record LLM metrics synchronously (no coroutine for hot paths)"""
     try:
         status = "success" if success else "error"
         
@@ -315,6 +315,25 @@ async def record_llm_metrics(
         logger.error(f"Failed to record LLM metrics: {e}")
 
 
+async def record_llm_metrics(
+    request_id: str,
+    model: str,
+    provider: str,
+    duration: float,
+    success: bool,
+    tokens_used: Optional[int] = None,
+) -> None:
+    """Record LLM metrics"""
+    observe_llm_metrics(
+        request_id=request_id,
+        model=model,
+        provider=provider,
+        duration=duration,
+        success=success,
+        tokens_used=tokens_used,
+    )
+
+
 async def record_rag_metrics(
     request_id: str,
     vector_store: str,
@@ -347,12 +366,8 @@ async def record_rag_metrics(
         logger.error(f"Failed to record RAG metrics: {e}")
 
 
-async def record_cache_metrics(
-    cache_type: str,
-    hit: bool,
-    duration: Optional[float] = None,
-) -> None:
-    """Record cache metrics"""
+def observe_cache_metrics(cache_type: str, hit: bool) -> None:
+    """Record cache metrics synchronously (no coroutine for hot paths)"""
     try:
         if hit:
             cache_hits_total.labels(cache_type=cache_type).inc()
@@ -365,6 +380,15 @@ async def record_cache_metrics(
         logger.error(f"Failed to record cache metrics: {e}")
 
 
+async def record_cache_metrics(
+    cache_type: str,
+    hit: bool,
+    duration: Optional[float] = None,
+) -> None:
+    """Record cache metrics"""
+    observe_cache_metrics(cache_type, hit)
+
+
 async def record_connection_metrics(
     service: str,
     connected: bool,
@@ -774,6 +798,24 @@ async def record_document_processing(
         logger.error(f"Failed to record document processing metrics: {e}")
 
 
+async def record_document_processing_batch(
+    documents_processed: int,
+    chunks_created: int,
+    duration: float,
+) -> None:
+    """Record one metrics entry for a batch of processed documents"""
+    try:
+        logger.info(
+            "Document batch processing metrics: %s documents, %s chunks, %.2fs",
+            documents_processed,
+            chunks_created,
+            duration,
+        )
+        
+    except Exception as e:
+        logger.error(f"Failed to record document batch metrics: {e}")
+
+
 async def record_rag_retrieval(
     request_id: str,
     query_length: int,
@@ -0,0 +1,27 @@
+"""
+Database initialization tests for HealthLang AI MVP.
+"""
+
+from sqlalchemy import create_engine, inspect, text
+
+from app.database import create_missing_indexes
+from app.models.database_models import Base
+
+
+def _query_indexes(engine):
+    return {index["name"] for index in inspect(engine).get_indexes("queries")}
+
+
+def test_missing_indexes_are_added_to_existing_tables():
+    """Indexes added to a model after its table exists are created."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX idx_queries_user_timestamp_id"))
+    assert "idx_queries_user_timestamp_id" not in _query_indexes(engine)
+
+    create_missing_indexes(bind=engine)
+    # A second run finds everything in place and does nothing
+    create_missing_indexes(bind=engine)
+
+    assert "idx_queries_user_timestamp_id" in _query_indexes(engine)
@@ -0,0 +1,86 @@
+"""
+Document processor chunking tests for HealthLang AI MVP.
+"""
+
+import pytest
+
+from app.services.rag.document_processor import (
+    DocumentProcessor,
+    ProcessingOptions,
+    _SENTENCE_END_RE,
+    _split_sentences,
+)
+from app.services.rag.vector_store import Document
+
+
+def _chunk(text: str, chunk_size: int, chunk_overlap: int):
+    document = Document(id="doc", content=text)
+    options = ProcessingOptions(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    return DocumentProcessor()._chunk_fixed_size(text, document, options, {})
+
+
+def test_overlap_not_smaller_than_chunk_size_is_rejected():
+    """Options whose overlap would stall the fixed-size window are invalid."""
+    for overlap in (10, 25, -1):
+        with pytest.raises(ValueError, match="chunk_overlap"):
+            ProcessingOptions(chunk_size=10, chunk_overlap=overlap)
+
+
+def test_word_break_inside_overlap_advances_to_end():
+    """Word breaks that fall inside the overlap don't degrade to 1-char steps."""
+    text = ("x" * 12 + " ") * 20
+    chunk_size = 20
+
+    chunks = _chunk(text, chunk_size=chunk_size, chunk_overlap=15)
+
+    # One chunk per word here; a one-character step would give ~len(text)
+    assert len(chunks) <= 2 * len(text) / chunk_size
+    assert chunks[-1].metadata["chunk_end"] >= len(text.rstrip())
+    starts = [chunk.metadata["chunk_start"] for chunk in chunks]
+    assert starts == sorted(set(starts))
+
+
+def test_fixed_size_without_overlap_tiles_the_text():
+    """With no overlap and no spaces, chunks tile the text exactly."""
+    text = "abcdefghij" * 5
+
+    chunks = _chunk(text, chunk_size=10, chunk_overlap=0)
+
+    assert [chunk.content for chunk in chunks] == ["abcdefghij"] * 5
+
+
+def test_fixed_size_text_shorter_than_overlap_is_one_chunk():
+    """Text shorter than the overlap becomes a single, complete chunk."""
+    chunks = _chunk("short note", chunk_size=1000, chunk_overlap=200)
+
+    assert [chunk.content for chunk in chunks] == ["short note"]
+    assert chunks[0].id == "doc_chunk_0"
+
+
+def test_fixed_size_breaks_on_word_boundaries_with_overlap():
+    """Chunks end at spaces and the next chunk steps back by the overlap."""
+    text = "alpha beta gamma delta epsilon zeta eta theta"
+    chunks = _chunk(text, chunk_size=20, chunk_overlap=6)
+
+    assert all(not chunk.content.startswith(" ") for chunk in chunks)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.metadata["chunk_start"] == previous.metadata["chunk_end"] - 6
+
+
+def test_split_sentences_ascii_translate_path_matches_regex():
+    """The str.translate fast path splits like the regex, runs of terminators included."""
+    text = "Take with food. Avoid alcohol!! Any questions?  Call us...done"
+
+    expected = [
+        part.strip() for part in _SENTENCE_END_RE.split(text) if part.strip()
+    ]
+    assert _split_sentences(text) == expected
+    assert expected == [
+        "Take with food", "Avoid alcohol", "Any questions", "Call us", "done"
+    ]
+
+
+def test_split_sentences_non_ascii_and_nul_use_regex():
+    """Non-ASCII text and text containing NUL fall back to the regex split."""
+    assert _split_sentences("Ẹ kú àárọ̀. Báwo ni?") == ["Ẹ kú àárọ̀", "Báwo ni"]
+    assert _split_sentences("a\x00b. c") == ["a\x00b", "c"]
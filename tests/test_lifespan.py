@@ -0,0 +1,32 @@
+"""
+Application lifespan tests for HealthLang AI MVP.
+"""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import mcp_client_http
+from app.services.medical import llm_cache, llm_client
+
+
+def test_shutdown_continues_after_a_failing_close(monkeypatch):
+    """A close that raises is logged and the remaining closes still run."""
+    closed = []
+
+    async def failing_close():
+        raise ConnectionError("Redis already gone")
+
+    async def close_http_clients():
+        closed.append("llm_http")
+
+    async def close_llm_cache():
+        closed.append("llm_cache")
+
+    monkeypatch.setattr(mcp_client_http, "close_client", failing_close)
+    monkeypatch.setattr(llm_client, "close_http_clients", close_http_clients)
+    monkeypatch.setattr(llm_cache, "close_llm_cache", close_llm_cache)
+
+    with TestClient(app):
+        pass
+
+    assert closed == ["llm_http", "llm_cache"]
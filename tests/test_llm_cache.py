@@ -0,0 +1,83 @@
+"""
+LLM response cache tests for HealthLang AI MVP.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.medical.llm_cache import LLMCache
+from app.services.medical.llm_client import LLMRequest, LLMResponse
+
+
+def _response(content: str = "Drink water.") -> LLMResponse:
+    return LLMResponse(
+        content=content,
+        model="test-model",
+        usage={"total_tokens": 5},
+        finish_reason="stop",
+        response_time=0.5,
+        provider="groq",
+    )
+
+
+def test_only_low_temperature_buffered_requests_are_cacheable():
+    """Streaming and high-temperature requests bypass the cache."""
+    assert LLMCache.is_cacheable(LLMRequest(prompt="q", temperature=0.1))
+    assert not LLMCache.is_cacheable(LLMRequest(prompt="q", temperature=0.7))
+    assert not LLMCache.is_cacheable(
+        LLMRequest(prompt="q", temperature=0.1, stream=True)
+    )
+
+
+def test_make_key_covers_sampling_inputs():
+    """Any input that changes the completion changes the key."""
+    request = LLMRequest(prompt="q", temperature=0.1)
+    key = LLMCache.make_key("groq", "m", request)
+
+    assert key == LLMCache.make_key("groq", "m", LLMRequest(prompt="q", temperature=0.1))
+    assert key != LLMCache.make_key("local", "m", request)
+    assert key != LLMCache.make_key("groq", "m", LLMRequest(prompt="q", temperature=0.0))
+
+
+@pytest.mark.asyncio
+async def test_get_miss_then_hit_returns_copy():
+    """A stored response is returned as a copy callers may mutate."""
+    cache = LLMCache(maxsize=8, ttl=60)
+
+    assert await cache.get("k") is None
+
+    await cache.set("k", _response())
+    first = await cache.get("k")
+    first.response_time = 99.0
+
+    second = await cache.get("k")
+    assert second.content == "Drink water."
+    assert second.response_time == 0.5
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl():
+    """Entries older than the TTL are misses."""
+    cache = LLMCache(maxsize=8, ttl=0.05)
+    await cache.set("k", _response())
+
+    await asyncio.sleep(0.1)
+
+    assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_unreachable_redis_falls_back_to_memory():
+    """Redis errors are logged and treated as misses, not raised."""
+    # Nothing listens on port 1, so every Redis call fails to connect
+    cache = LLMCache(maxsize=8, ttl=60, redis_url="redis://127.0.0.1:1/0")
+    try:
+        assert await cache.get("k") is None
+
+        await cache.set("k", _response())
+        cached = await cache.get("k")
+        assert cached is not None
+        assert cached.content == "Drink water."
+    finally:
+        await cache.close()
@@ -0,0 +1,126 @@
+"""
+LLM client retry and rate-limit tests for HealthLang AI MVP.
+"""
+
+import time
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services.medical import llm_client
+from app.services.medical.llm_client import _TokenBucket, _send_with_retries
+
+
+class _Sends:
+    """Replays canned status codes as httpx responses."""
+
+    def __init__(self, *statuses: int, headers=None):
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.calls = 0
+
+    async def __call__(self) -> httpx.Response:
+        status = self.statuses[min(self.calls, len(self.statuses) - 1)]
+        self.calls += 1
+        return httpx.Response(
+            status,
+            headers=self.headers,
+            request=httpx.Request("POST", "http://llm.test/v1/chat/completions"),
+        )
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(llm_client.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+@pytest.mark.asyncio
+async def test_retries_429_and_5xx_with_growing_backoff(sleeps):
+    """Rate limits and server errors are retried with jittered exponential backoff."""
+    send = _Sends(429, 503, 200)
+
+    response = await _send_with_retries(send)
+
+    assert response.status_code == 200
+    assert send.calls == 3
+    assert len(sleeps) == 2
+    assert 0.5 <= sleeps[0] <= 1.5
+    assert 1.0 <= sleeps[1] <= 2.0
+
+
+@pytest.mark.asyncio
+async def test_retry_after_header_sets_delay(sleeps):
+    """A Retry-After header replaces the computed backoff."""
+    send = _Sends(429, 200, headers={"retry-after": "2"})
+
+    await _send_with_retries(send)
+
+    assert sleeps == [2.0]
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(sleeps):
+    """4xx responses other than 408/425/429 fail immediately."""
+    send = _Sends(400)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await _send_with_retries(send)
+
+    assert send.calls == 1
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(sleeps):
+    """Persistent server errors are raised once the retry budget is spent."""
+    send = _Sends(502)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await _send_with_retries(send)
+
+    assert send.calls == settings.LLM_MAX_RETRIES + 1
+    assert len(sleeps) == settings.LLM_MAX_RETRIES
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_once_drained():
+    """An empty bucket delays acquire until it has refilled."""
+    bucket = _TokenBucket(per_minute=600)  # 10 per second
+    bucket.consume(600)
+
+    start = time.monotonic()
+    await bucket.acquire()
+
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_repays_overdraft_before_acquire():
+    """Tokens consumed past zero must be paid back before the next acquire."""
+    bucket = _TokenBucket(per_minute=600)
+    bucket.consume(601)
+
+    start = time.monotonic()
+    await bucket.acquire()
+
+    assert time.monotonic() - start >= 0.19
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_does_not_wait_with_budget_left():
+    """Acquire returns immediately while the bucket has tokens."""
+    bucket = _TokenBucket(per_minute=600)
+
+    start = time.monotonic()
+    for _ in range(10):
+        await bucket.acquire()
+
+    assert time.monotonic() - start < 0.05
@@ -0,0 +1,115 @@
+"""
+MCP client session lifecycle tests for HealthLang AI MVP.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+pytest.importorskip("mcp")
+
+from app.config import settings
+from app.services.mcp.mcp_client import MCPClient
+
+
+class FakeSession:
+    """Tool session that fails with a broken pipe once ``broken`` is set."""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.broken = False
+
+    async def call_tool(self, tool_name, arguments):
+        await asyncio.sleep(0)
+        if self.broken:
+            raise BrokenPipeError("server exited")
+        text = f"{tool_name} from session {self.number}"
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+class FakeServerClient(MCPClient):
+    """MCPClient whose 'subprocess' is an in-process fake session."""
+
+    def __init__(self):
+        super().__init__()
+        self.sessions = []
+
+    async def _connect_to_healthcare_server(self) -> None:
+        self._shutdown = asyncio.Event()
+        self._session_task = asyncio.create_task(self._shutdown.wait())
+        self.session = FakeSession(len(self.sessions) + 1)
+        self.sessions.append(self.session)
+
+
+@pytest_asyncio.fixture
+async def mcp():
+    client = FakeServerClient()
+    await client.connect()
+    client._initialized = True
+    yield client
+    await client.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_broken_calls_reconnect_once(mcp):
+    """Callers that hit the same dead session share one replacement."""
+    mcp.session.broken = True
+
+    results = await asyncio.gather(
+        mcp.call_tool("medical_lookup", "{}"),
+        mcp.call_tool("icd10_lookup", "{}"),
+        mcp.call_tool("pubmed_search", "{}"),
+    )
+
+    assert len(mcp.sessions) == 2
+    assert results == [
+        "medical_lookup from session 2",
+        "icd10_lookup from session 2",
+        "pubmed_search from session 2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stale_failure_does_not_drop_replacement_session(mcp):
+    """A failure seen on an already-replaced session keeps the new one."""
+    old = mcp.session
+    await mcp._reconnect(old)
+    replacement = mcp.session
+
+    await mcp._reconnect(old)
+
+    assert mcp.session is replacement
+    assert len(mcp.sessions) == 2
+
+
+@pytest.mark.asyncio
+async def test_idle_watchdog_stops_session_and_call_reconnects(mcp, monkeypatch):
+    """Idle sessions are reaped, and the next tool call brings one back."""
+    monkeypatch.setattr(settings, "MCP_IDLE_TIMEOUT", 0.05)
+    mcp._idle_watchdog.cancel()
+    mcp._idle_watchdog = asyncio.create_task(mcp._watch_idle())
+    task = mcp._session_task
+
+    await asyncio.wait_for(mcp._idle_watchdog, timeout=1)
+
+    assert mcp.session is None
+    assert task.done()
+    result = await mcp.call_tool("medical_lookup", "{}")
+    assert result == "medical_lookup from session 2"
+
+
+@pytest.mark.asyncio
+async def test_idle_watchdog_keeps_recently_used_session(mcp, monkeypatch):
+    """A session used within the idle timeout stays open."""
+    monkeypatch.setattr(settings, "MCP_IDLE_TIMEOUT", 0.2)
+    mcp._idle_watchdog.cancel()
+    mcp._idle_watchdog = asyncio.create_task(mcp._watch_idle())
+
+    for _ in range(4):
+        await asyncio.sleep(0.1)
+        await mcp.call_tool("medical_lookup", "{}")
+
+    assert mcp.session is mcp.sessions[0]
+    assert not mcp._idle_watchdog.done()
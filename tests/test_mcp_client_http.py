@@ -0,0 +1,72 @@
+"""
+MCP HTTP client response cache tests for HealthLang AI MVP.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services import mcp_client_http
+from app.core.exceptions import MCPClientError
+from app.services.mcp_client_http import MCPBatcher, mcp_get
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Serve GETs from memory and count the upstream round trips."""
+    calls = []
+
+    async def fake_fetch(endpoint, params=None):
+        calls.append((endpoint, params))
+        await asyncio.sleep(0)
+        return {"status": "ok", "results": [{"name": "ibuprofen"}]}
+
+    monkeypatch.setattr(mcp_client_http, "_batcher", MCPBatcher(fake_fetch))
+    mcp_client_http._response_cache.clear()
+    yield calls
+    mcp_client_http._response_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_cached_result_is_not_shared_with_callers(fetches):
+    """Mutating a returned payload does not change later cache hits."""
+    first = await mcp_get("/api/fda", {"drug_name": "ibuprofen"})
+    first["results"].append({"name": "tampered"})
+
+    second = await mcp_get("/api/fda", {"drug_name": "ibuprofen"})
+
+    assert second == {"status": "ok", "results": [{"name": "ibuprofen"}]}
+    assert len(fetches) == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesced_callers_get_separate_copies(fetches):
+    """Concurrent callers share one fetch but not one dict."""
+    first, second = await asyncio.gather(
+        mcp_get("/api/icd10", {"term": "asthma"}),
+        mcp_get("/api/icd10", {"term": "asthma"}),
+    )
+
+    assert first == second
+    assert first is not second
+    assert len(fetches) == 1
+
+
+@pytest.mark.asyncio
+async def test_health_probe_is_never_served_from_cache(monkeypatch):
+    """A failing health check after a successful one reaches the server."""
+    responses = [{"status": "ok"}, MCPClientError(message="down", status_code=502)]
+
+    async def fake_fetch(endpoint, params=None):
+        result = responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(mcp_client_http, "_batcher", MCPBatcher(fake_fetch))
+    mcp_client_http._response_cache.clear()
+
+    assert await mcp_get("/health") == {"status": "ok"}
+    with pytest.raises(MCPClientError):
+        await mcp_get("/health")
+    assert responses == []
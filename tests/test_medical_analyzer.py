@@ -0,0 +1,174 @@
+"""
+Medical analyzer tests for HealthLang AI MVP.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.medical.llm_client import LLMResponse
+from app.services.medical.medical_analyzer import (
+    MedicalAnalysisRequest,
+    MedicalAnalyzer,
+    MedicalQueryType,
+    SafetyLevel,
+)
+from app.utils.cache import TTLLRUCache
+
+
+class StubLLMClient:
+    """LLM client double that records prompts and replies with fixed text."""
+
+    def __init__(
+        self,
+        content: str = "Rest and drink fluids.",
+        safety_level: str = "SAFE",
+    ):
+        self.content = content
+        self.safety_level = safety_level
+        self.prompts = []
+
+    async def generate(self, request):
+        self.prompts.append(request.prompt)
+        if "Assess the safety level" in request.prompt:
+            content = self.safety_level
+        else:
+            content = self.content
+        return LLMResponse(
+            content=content,
+            model="stub",
+            usage={},
+            finish_reason="stop",
+            response_time=0.0,
+            provider="stub",
+        )
+
+
+def _request(query: str) -> MedicalAnalysisRequest:
+    return MedicalAnalysisRequest(
+        query=query, query_type=MedicalQueryType.GENERAL_QUESTION
+    )
+
+
+@pytest.mark.asyncio
+async def test_llm_safety_assessment_level_is_kept():
+    """The LLM's safety level is returned rather than the CAUTION fallback."""
+    analyzer = MedicalAnalyzer(StubLLMClient(safety_level="URGENT"))
+
+    level = await analyzer._perform_safety_check(
+        _request("my head hurts when I cough"), None
+    )
+
+    assert level is SafetyLevel.URGENT
+
+
+@pytest.mark.asyncio
+async def test_cached_call_waiter_recomputes_after_owner_cancelled():
+    """Cancelling the computing caller doesn't cancel callers waiting on it."""
+    analyzer = MedicalAnalyzer(StubLLMClient())
+    cache = TTLLRUCache(maxsize=8, ttl=60)
+    started = asyncio.Event()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            started.set()
+            await asyncio.sleep(60)
+        return "fresh"
+
+    owner = asyncio.create_task(analyzer._cached_call(cache, "k", compute))
+    await started.wait()
+    waiter = asyncio.create_task(analyzer._cached_call(cache, "k", compute))
+    await asyncio.sleep(0)
+    owner.cancel()
+
+    assert await waiter == "fresh"
+    assert owner.cancelled()
+    assert calls == 2
+    assert analyzer._inflight == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", ["hello there", "Thank you so much!", "ok"])
+async def test_greetings_are_safe_without_llm(query):
+    """Allowlisted pleasantries are SAFE without an LLM call."""
+    llm = StubLLMClient(safety_level="URGENT")
+    analyzer = MedicalAnalyzer(llm)
+
+    level = await analyzer._perform_safety_check(_request(query), None)
+
+    assert level is SafetyLevel.SAFE
+    assert llm.prompts == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "query",
+    [
+        "I want to end my life",
+        "my friend collapsed and is not responding",
+        "my kid swallowed a battery",
+        "choking",
+        "I cut myself",
+        "hello, I cut myself",
+    ],
+)
+async def test_short_unlisted_queries_get_llm_safety_call(query):
+    """Short queries with no keyword hit still go to the LLM for triage."""
+    llm = StubLLMClient(safety_level="EMERGENCY")
+    analyzer = MedicalAnalyzer(llm)
+
+    level = await analyzer._perform_safety_check(_request(query), None)
+
+    assert level is SafetyLevel.EMERGENCY
+    assert len(llm.prompts) == 1
+    assert "Assess the safety level" in llm.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_analyze_end_to_end_with_stub_llm():
+    """A clinical query runs the LLM safety check and analysis together."""
+    llm = StubLLMClient(
+        content="1. Rest and drink fluids.\n2. Consult a doctor if it persists.",
+        safety_level="CAUTION",
+    )
+    analyzer = MedicalAnalyzer(llm)
+
+    response = await analyzer.analyze(_request("my head hurts when I cough"))
+
+    assert response.safety_level is SafetyLevel.CAUTION
+    assert response.query_type is MedicalQueryType.GENERAL_QUESTION
+    assert "Rest and drink fluids" in response.analysis
+    assert len(llm.prompts) == 2
+
+
+@pytest.mark.asyncio
+async def test_curated_emergency_phrase_skips_llm():
+    """Curated emergency phrases return the canned response without the LLM."""
+    llm = StubLLMClient()
+    analyzer = MedicalAnalyzer(llm)
+
+    response = await analyzer.analyze(_request("I have chest pain"))
+
+    assert response.safety_level is SafetyLevel.EMERGENCY
+    assert "chest pain" in response.emergency_indicators
+    assert llm.prompts == []
+
+
+@pytest.mark.asyncio
+async def test_generic_emergency_keyword_still_runs_analysis():
+    """Generic keywords like 'acute' raise the level but keep the LLM analysis."""
+    llm = StubLLMClient()
+    analyzer = MedicalAnalyzer(llm)
+
+    response = await analyzer.analyze(
+        _request("what is acute sinusitis treatment?")
+    )
+
+    assert response.safety_level is SafetyLevel.EMERGENCY
+    assert "Rest and drink fluids" in response.analysis
+    # Only the analysis prompt; the keyword hit replaces the LLM safety check
+    assert len(llm.prompts) == 1
+    assert "acute sinusitis" in llm.prompts[0]
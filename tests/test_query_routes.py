@@ -0,0 +1,78 @@
+"""
+Query route serialization tests for HealthLang AI MVP.
+"""
+
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+
+import numpy as np
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.api.routes.query import _json_response
+
+
+class _Level(Enum):
+    LOW = 1
+
+
+class _Source(BaseModel):
+    title: str
+
+
+def test_json_response_encodes_known_non_native_types():
+    """Enums, models, sets, decimals and paths are encoded explicitly."""
+    response = _json_response({
+        "level": _Level.LOW,
+        "source": _Source(title="WHO"),
+        "tags": {"rag"},
+        "score": Decimal("0.5"),
+        "file": Path("docs/who.pdf"),
+    })
+
+    assert orjson.loads(response.body) == {
+        "level": 1,
+        "source": {"title": "WHO"},
+        "tags": ["rag"],
+        "score": 0.5,
+        "file": "docs/who.pdf",
+    }
+    assert response.media_type == "application/json; charset=utf-8"
+
+
+def test_json_response_rejects_unknown_types():
+    """Unknown objects raise instead of being stringified."""
+    with pytest.raises(TypeError, match="object"):
+        _json_response({"metadata": object()})
+
+
+def test_json_response_encodes_numpy_values():
+    """numpy scalars and arrays from model outputs encode as plain numbers."""
+    response = _json_response({
+        "confidence": np.float64(0.75),
+        "rank": np.int64(2),
+        "scores": np.array([0.5, 0.25]),
+    })
+
+    assert orjson.loads(response.body) == {
+        "confidence": 0.75,
+        "rank": 2,
+        "scores": [0.5, 0.25],
+    }
+
+
+def test_batch_route_documents_its_response_schema(client: TestClient):
+    """The raw orjson batch route still publishes BatchQueryResponse in OpenAPI."""
+    spec = client.get("/openapi.json").json()
+
+    batch_paths = [path for path in spec["paths"] if path.endswith("/query/batch")]
+    assert batch_paths
+    schema = spec["paths"][batch_paths[0]]["post"]["responses"]["200"]
+    assert schema["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/BatchQueryResponse"
+    }
+    fields = spec["components"]["schemas"]["BatchQueryResponse"]["properties"]
+    assert {"batch_id", "total_requests", "successful", "failed", "results", "errors"} <= set(fields)
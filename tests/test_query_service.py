@@ -0,0 +1,126 @@
+"""
+Query history service tests for HealthLang AI MVP.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.database_models import Query
+from app.services.query_service import QueryService
+
+
+def _add_queries(db_session, user_id: str, count: int) -> datetime:
+    """Insert ``count`` queries one minute apart; returns the oldest timestamp."""
+    oldest = datetime(2024, 1, 1, 12, 0, 0)
+    db_session.add_all(
+        Query(
+            user_id=user_id,
+            query_text=f"question {i}",
+            response_text=f"answer {i}",
+            processing_time=0.1,
+            timestamp=oldest + timedelta(minutes=i),
+        )
+        for i in range(count)
+    )
+    db_session.commit()
+    return oldest
+
+
+@pytest.mark.asyncio
+async def test_keyset_history_pages_newest_first_without_overlap(db_session):
+    """Each page continues strictly before the previous page's last timestamp."""
+    _add_queries(db_session, "user-1", 5)
+    _add_queries(db_session, "user-2", 2)
+
+    pages = []
+    before = before_id = None
+    while True:
+        page = await QueryService.get_user_query_history_before(
+            db_session, "user-1", before=before, before_id=before_id, limit=2
+        )
+        if not page:
+            break
+        pages.append([query.query_text for query in page])
+        before, before_id = page[-1].timestamp, page[-1].id
+
+    assert pages == [
+        ["question 4", "question 3"],
+        ["question 2", "question 1"],
+        ["question 0"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_keyset_history_keeps_rows_sharing_a_timestamp(db_session):
+    """Rows with the same timestamp across a page boundary are all returned."""
+    shared = datetime(2024, 1, 1, 12, 0, 0)
+    db_session.add_all(
+        Query(
+            id=f"id-{i}",
+            user_id="user-1",
+            query_text=f"question {i}",
+            response_text=f"answer {i}",
+            processing_time=0.1,
+            timestamp=shared,
+        )
+        for i in range(5)
+    )
+    db_session.commit()
+
+    seen = []
+    before = before_id = None
+    while True:
+        page = await QueryService.get_user_query_history_before(
+            db_session, "user-1", before=before, before_id=before_id, limit=2
+        )
+        if not page:
+            break
+        seen.extend(query.id for query in page)
+        before, before_id = page[-1].timestamp, page[-1].id
+
+    assert seen == ["id-4", "id-3", "id-2", "id-1", "id-0"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_creates_every_record(db_session):
+    """Bulk insert writes all rows with the same column mapping as single inserts."""
+    inserted = await QueryService.create_query_records_bulk(
+        db_session,
+        [
+            {
+                "user_id": "user-1",
+                "query_text": f"question {i}",
+                "response_text": f"answer {i}",
+                "processing_time": 0.2,
+                "success": True,
+                "sources": [{"url": "https://who.int"}, "cdc"],
+            }
+            for i in range(3)
+        ],
+    )
+
+    assert inserted == 3
+    rows = db_session.query(Query).filter(Query.user_id == "user-1").all()
+    assert sorted(row.query_text for row in rows) == [
+        "question 0", "question 1", "question 2"
+    ]
+    assert {row.sources for row in rows} == {"https://who.int,cdc"}
+    assert all(row.id for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_with_no_records_is_a_no_op(db_session):
+    """An empty batch returns 0 without touching the database."""
+    assert await QueryService.create_query_records_bulk(db_session, []) == 0
+
+
+@pytest.mark.asyncio
+async def test_count_estimate_falls_back_to_exact_count_off_postgres(db_session):
+    """SQLite has no planner estimate, so the exact count is returned."""
+    _add_queries(db_session, "user-1", 3)
+    _add_queries(db_session, "user-2", 1)
+
+    assert await QueryService.get_query_count_estimate(db_session) == 4
+    assert await QueryService.get_query_count_exact(db_session) == 4
+    assert await QueryService.get_query_count(db_session, user_id="user-1") == 3